@@ -0,0 +1,143 @@
+"""RECORD lines written per second for sales orders with many line items.
+
+Compares the SDK's message path (a `RecordMessage` per record, formatted with
+simplejson and flushed to stdout line by line) with the streams'
+`MessageWriter`, encoding with orjson when it is installed and with simplejson
+otherwise. The orders fill every property of the sales order details schema,
+already conformed, and are written to ``os.devnull``.
+
+Run with ``python -m benchmarks.bench_emit``, e.g.::
+
+    python -m benchmarks.bench_emit --records 200 --line-items 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import singer_sdk._singerlib as singer
+from singer_sdk.helpers._util import utc_now
+
+from benchmarks.bench_schema import sample_value
+from tap_zoho_inventory import output
+from tap_zoho_inventory.output import MessageWriter
+
+STREAM = "sales_orders_details"
+# The schema leaves the line items untyped, they get the shape Zoho sends
+LINE_ITEM = {
+    "item_id": "4000000012345",
+    "sku": "SKU-12345",
+    "name": "Stainless steel water bottle, 750 ml",
+    "description": "",
+    "item_order": 0,
+    "bcy_rate": 12.5,
+    "rate": 12.5,
+    "quantity": 3.0,
+    "quantity_invoiced": 0.0,
+    "quantity_packed": 0.0,
+    "quantity_shipped": 0.0,
+    "unit": "pcs",
+    "tax_id": "4000000000101",
+    "tax_name": "VAT",
+    "tax_type": "tax",
+    "tax_percentage": 20.0,
+    "item_total": 37.5,
+    "discount": 0.0,
+    "warehouse_id": "4000000000201",
+    "warehouse_name": "Main warehouse",
+    "is_combo_product": False,
+    "item_custom_fields": [{"api_name": "cf_colour", "label": "Colour", "value": "Blue"}],
+    "tags": [{"tag_id": "4000000000301", "tag_option_name": "Summer"}],
+}
+
+
+@contextmanager
+def stdout_to_devnull():
+    stdout = sys.stdout
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+def sdk_emit(records: list[dict]) -> None:
+    for record in records:
+        singer.write_message(
+            singer.RecordMessage(stream=STREAM, record=record, time_extracted=utc_now())
+        )
+
+
+def writer_emit(records: list[dict], buffer_size: int) -> None:
+    writer = MessageWriter(buffer_size)
+    for record in records:
+        writer.write([writer.encode_record(STREAM, record, utc_now())])
+    writer.flush()
+
+
+def measure(emit, records: list[dict], runs: int) -> float:
+    """Return the best time ``emit`` takes to write the records, in seconds."""
+    best = float("inf")
+    with stdout_to_devnull():
+        for _ in range(runs):
+            start = time.perf_counter()
+            emit(records)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100)
+    parser.add_argument("--line-items", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--buffer-size", type=int, default=1024 * 1024)
+    args = parser.parse_args()
+
+    from tap_zoho_inventory.tap import TapZohoInventory
+    from tests.mock_api import MOCK_CONFIG, mock_zoho
+
+    with mock_zoho():
+        stream = TapZohoInventory(config=MOCK_CONFIG).streams[STREAM]
+    order = sample_value(stream.schema, 1)
+    order["line_items"] = [
+        {**LINE_ITEM, "line_item_id": str(4000000000000 + line), "item_order": line}
+        for line in range(args.line_items)
+    ]
+    conformed, _ = stream._conform_record(order)
+    records = [conformed] * args.records
+    line_bytes = len(MessageWriter().encode_record(STREAM, conformed, utc_now()))
+
+    def emit(records):
+        writer_emit(records, args.buffer_size)
+
+    results = [("SDK write_message", measure(sdk_emit, records, args.runs))]
+    orjson, output.orjson = output.orjson, None
+    try:
+        results.append(("writer, simplejson", measure(emit, records, args.runs)))
+    finally:
+        output.orjson = orjson
+    if orjson is not None:
+        results.append(("writer, orjson", measure(emit, records, args.runs)))
+
+    print(
+        f"{args.records} orders of {args.line_items} line items, "
+        f"{line_bytes / 1024:.0f} KiB per line, best of {args.runs}:"
+    )
+    print(f"{'path':<22}{'lines/s':>10}{'MiB/s':>10}{'speedup':>9}")
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(
+            f"{name:<22}{args.records / seconds:>10.1f}"
+            f"{args.records * line_bytes / seconds / 2**20:>10.1f}"
+            f"{baseline / seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
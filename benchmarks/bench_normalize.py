@@ -0,0 +1,116 @@
+"""Throughput of the empty-string normalizer on a detailed salesorder.
+
+Run with ``python -m benchmarks.bench_normalize``.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import timeit
+
+from tap_zoho_inventory.client import SCHEMAS_DIR, ZohoInventoryStream
+
+SCHEMA_FILE = SCHEMAS_DIR / "salesorders_details_indv_schema.json"
+ARRAY_LENGTH = 2
+# The schema leaves arrays untyped, their entries get this shape instead.
+ARRAY_ITEM = {
+    **{f"text_{n}": "" for n in range(20)},
+    **{f"amount_{n}": 1.5 for n in range(10)},
+    "tags": [{"tag_id": "", "tag_option_name": ""}],
+}
+REPEAT = 5
+NUMBER = 200
+
+
+def make_value(schema: dict, array_length: int = ARRAY_LENGTH):
+    """Build a value for every property of a schema, strings left empty."""
+    types = schema.get("type", [])
+    types = [types] if isinstance(types, str) else list(types)
+    for option in schema.get("anyOf", []):
+        types.append(option.get("type"))
+    if "object" in types or "properties" in schema:
+        return {
+            key: make_value(value, array_length)
+            for key, value in schema.get("properties", {}).items()
+        }
+    if "array" in types:
+        if "items" not in schema:
+            return [copy.deepcopy(ARRAY_ITEM) for _ in range(array_length)]
+        return [
+            make_value(schema["items"], array_length)
+            for _ in range(array_length)
+        ]
+    if "string" in types:
+        return ""
+    if "boolean" in types:
+        return False
+    return 0
+
+
+def count_leaves(value) -> int:
+    """Count the scalar values of a record."""
+    if isinstance(value, dict):
+        return sum(count_leaves(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(count_leaves(v) for v in value)
+    return 1
+
+
+def recursive_replace_value(obj, val, replacement) -> None:
+    """The recursive normalizer used before, which skips lists."""
+    for key in obj:
+        if type(obj[key]) == dict:
+            recursive_replace_value(obj[key], val, replacement)
+        elif obj[key] == val:
+            obj[key] = replacement
+
+
+def recursive_replace_value_in_lists(obj, val, replacement) -> None:
+    """The same walk as `replace_value`, recursing instead of using a stack."""
+    val_type = type(val)
+    if type(obj) is dict:
+        for key, value in obj.items():
+            value_type = type(value)
+            if value_type is dict or value_type is list:
+                recursive_replace_value_in_lists(value, val, replacement)
+            elif value_type is val_type and value == val:
+                obj[key] = replacement
+    else:
+        for value in obj:
+            value_type = type(value)
+            if value_type is dict or value_type is list:
+                recursive_replace_value_in_lists(value, val, replacement)
+
+
+def run() -> None:
+    """Print records/second for every normalizer."""
+    record = make_value(json.loads(SCHEMA_FILE.read_text()))
+    records = [copy.deepcopy(record) for _ in range(NUMBER * REPEAT * 2)]
+    print(f"record: {count_leaves(record)} leaf values")
+
+    for label, func in (
+        ("recursive, dicts only", recursive_replace_value),
+        ("recursive, dicts and lists", recursive_replace_value_in_lists),
+        (
+            "iterative, dicts and lists",
+            lambda obj, val, rep: ZohoInventoryStream.replace_value(None, obj, val, rep),
+        ),
+    ):
+        pending = iter(records)
+        seconds = min(
+            timeit.repeat(
+                lambda: func(next(pending), "", None), number=NUMBER, repeat=REPEAT
+            )
+        ) / NUMBER
+        sample = copy.deepcopy(record)
+        func(sample, "", None)
+        left = json.dumps(sample).count('""')
+        print(
+            f"{label:<28} {1 / seconds:10.0f} records/s"
+            f"  ({left} empty strings left)"
+        )
+
+
+if __name__ == "__main__":
+    run()
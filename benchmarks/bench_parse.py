@@ -0,0 +1,102 @@
+"""Per-page decode cost of a list response, before and after memoization.
+
+Run with ``python -m benchmarks.bench_parse``.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+
+import requests
+
+from tap_zoho_inventory import client
+from tap_zoho_inventory.client import ZohoInventoryStream
+
+PAGE_SIZE = 200
+LINE_ITEMS = 20
+REPEAT = 50
+
+
+def make_page(page_size: int = PAGE_SIZE, line_items: int = LINE_ITEMS) -> bytes:
+    """Build a synthetic `/salesorders` list page."""
+    records = [
+        {
+            "salesorder_id": str(4000000000000 + i),
+            "salesorder_number": f"SO-{i:05d}",
+            "customer_name": "Bowman & Co",
+            "status": "confirmed",
+            "total": 1024.5,
+            "last_modified_time": "2024-01-01T10:00:00+0000",
+            "custom_fields": [
+                {"api_name": f"cf_field_{n}", "value": ""} for n in range(5)
+            ],
+            "line_items": [
+                {
+                    "line_item_id": str(5000000000000 + n),
+                    "item_id": str(6000000000000 + n),
+                    "name": "Widget",
+                    "description": "",
+                    "quantity": 2,
+                    "rate": 12.5,
+                }
+                for n in range(line_items)
+            ],
+        }
+        for i in range(page_size)
+    ]
+    page_context = {
+        "page": 1,
+        "per_page": page_size,
+        "has_more_page": True,
+        "report_name": "Sales Orders",
+    }
+    return json.dumps({"salesorders": records, "page_context": page_context}).encode()
+
+
+def make_response(body: bytes) -> requests.Response:
+    """Wrap a body in a `requests.Response`."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = "utf-8"
+    return response
+
+
+def run() -> None:
+    """Print the decode cost of one page with each strategy."""
+    body = make_page()
+
+    def before() -> None:
+        # parse_response decoded the body four times, get_next_page_token twice.
+        response = make_response(body)
+        for _ in range(6):
+            response.json()
+
+    def after() -> None:
+        response = make_response(body)
+        for _ in range(6):
+            ZohoInventoryStream.decode_response(None, response)
+
+    def after_stdlib() -> None:
+        decoder, client.orjson = client.orjson, None
+        try:
+            after()
+        finally:
+            client.orjson = decoder
+
+    print(f"page: {PAGE_SIZE} records, {len(body) / 1024:.0f} KiB")
+    for label, func in (
+        ("response.json() x6", before),
+        ("memoized, stdlib json", after_stdlib),
+        ("memoized, orjson", after if client.orjson else None),
+    ):
+        if func is None:
+            print(f"{label:<24} skipped (orjson not installed)")
+            continue
+        seconds = min(timeit.repeat(func, number=1, repeat=REPEAT))
+        print(f"{label:<24} {seconds * 1000:8.2f} ms/page")
+
+
+if __name__ == "__main__":
+    run()
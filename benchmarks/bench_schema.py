@@ -0,0 +1,149 @@
+"""Tap startup time and per-record conformance cost of every stream schema.
+
+Startup is measured in a fresh interpreter: importing the tap, creating it
+(which loads every schema and fetches the custom fields from the offline Zoho
+stand-in) and building the discovery catalog.
+
+Conformance compares the SDK's per-record schema walk with the conformer
+compiled once per stream by `tap_zoho_inventory.conform`, on records filling
+every property of the stream schema.
+
+Run with ``python -m benchmarks.bench_schema``, e.g.::
+
+    python -m benchmarks.bench_schema --line-items 50 --streams sales_orders_details
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import logging
+import subprocess
+import sys
+import time
+
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from tap_zoho_inventory.client import load_schema
+from tap_zoho_inventory.tap import TapZohoInventory
+from tests.mock_api import MOCK_CONFIG, mock_zoho
+imported = time.perf_counter()
+with mock_zoho():
+    tap = TapZohoInventory(config=MOCK_CONFIG)
+    created = time.perf_counter()
+    tap.catalog_dict
+    discovered = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "init": created - imported,
+    "discovery": discovered - created,
+    "schema_files": load_schema.cache_info().currsize,
+}))
+"""
+
+
+def sample_value(schema: dict, line_items: int, depth: int = 0):
+    """Return a value of the type of ``schema``, lists holding ``line_items`` items."""
+    types = schema.get("type", "string")
+    types = [types] if isinstance(types, str) else types
+    if "object" in types and "properties" in schema and depth < 4:
+        return {
+            name: sample_value(property_schema, line_items, depth + 1)
+            for name, property_schema in schema["properties"].items()
+        }
+    if "array" in types and isinstance(schema.get("items"), dict) and depth < 4:
+        return [
+            sample_value(schema["items"], line_items, depth + 1)
+            for _ in range(line_items)
+        ]
+    if "boolean" in types:
+        return 1
+    if "integer" in types:
+        return 42
+    if "number" in types:
+        return 12.5
+    return "sample"
+
+
+def per_record_us(conform, records: list[dict]) -> float:
+    """Return the mean time ``conform`` takes per record, in microseconds."""
+    start = time.perf_counter()
+    for record in records:
+        conform(record)
+    return (time.perf_counter() - start) / len(records) * 1e6
+
+
+def bench_conform(args: argparse.Namespace) -> None:
+    from singer_sdk.helpers._catalog import pop_deselected_record_properties
+    from singer_sdk.helpers._typing import _conform_record_data_types
+
+    from tap_zoho_inventory.conform import compile_conformer
+    from tap_zoho_inventory.tap import TapZohoInventory
+    from tests.mock_api import MOCK_CONFIG, mock_zoho
+
+    with mock_zoho():
+        streams = TapZohoInventory(config=MOCK_CONFIG).streams
+    logger = logging.getLogger(__name__)
+    print(
+        f"{'stream':<28}{'properties':>11}{'compile ms':>12}"
+        f"{'SDK us/rec':>12}{'compiled us/rec':>17}{'speedup':>9}"
+    )
+    for name in args.streams or streams:
+        stream = streams[name]
+        schema, mask, level = stream.schema, stream.mask, stream.TYPE_CONFORMANCE_LEVEL
+        record = sample_value(schema, args.line_items)
+
+        def sdk_conform(record):
+            pop_deselected_record_properties(record, schema, mask, logger)
+            return _conform_record_data_types(record, schema, level, None)
+
+        start = time.perf_counter()
+        compiled_conform = compile_conformer(schema, mask, level)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        # The SDK modifies the records it conforms, each run gets fresh copies
+        sdk_us = per_record_us(
+            sdk_conform, [copy.deepcopy(record) for _ in range(args.records)]
+        )
+        compiled_us = per_record_us(
+            compiled_conform, [copy.deepcopy(record) for _ in range(args.records)]
+        )
+        print(
+            f"{name:<28}{len(schema['properties']):>11}{compile_ms:>12.2f}"
+            f"{sdk_us:>12.1f}{compiled_us:>17.1f}{sdk_us / compiled_us:>8.1f}x"
+        )
+
+
+def bench_startup(args: argparse.Namespace) -> None:
+    runs = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", STARTUP_SCRIPT],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.strip().splitlines()[-1]
+        )
+        for _ in range(args.startup_runs)
+    ]
+    print(f"startup, best of {args.startup_runs} fresh interpreters:")
+    for step in ("import", "init", "discovery"):
+        print(f"  {step:<12}{min(run[step] for run in runs) * 1000:>9.1f} ms")
+    print(f"  schema files parsed: {runs[0]['schema_files']}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--line-items", type=int, default=20)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--streams", nargs="*", help="streams to measure (default: all)")
+    args = parser.parse_args()
+    bench_startup(args)
+    bench_conform(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Per-stream throughput of a full sync against the offline Zoho stand-in.
+
+Every stream is synced on its own, in a fresh interpreter, against
+`tests.mock_api.ZohoMockAdapter`. The report shows records per second, API
+requests per record and the peak resident memory of each sync.
+
+Run with ``python -m benchmarks.bench_streams``, e.g.::
+
+    python -m benchmarks.bench_streams --records 2000 --latency 0.02
+    python -m benchmarks.bench_streams --streams sales_orders \
+        --config '{"detail_concurrency": 8}'
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import resource
+import subprocess
+import sys
+import time
+
+from tap_zoho_inventory.tap import TapZohoInventory
+from tests.mock_api import MOCK_CONFIG, ZohoMockAdapter, mock_zoho
+
+# The SDK writes `"type": "RECORD"`, the tap's message writer `"type":"RECORD"`
+RECORD_MARKER = re.compile(r'"type": ?"RECORD"')
+
+
+class _RecordCounter:
+    """Stand-in for stdout counting the RECORD messages written."""
+
+    def __init__(self) -> None:
+        self.records = 0
+
+    def write(self, data: str) -> int:
+        self.records += len(RECORD_MARKER.findall(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident memory of this process, in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def catalog_selecting(config: dict, stream_name: str) -> dict:
+    """Return the tap catalog with only ``stream_name`` selected."""
+    catalog = TapZohoInventory(config=config).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] == stream_name
+    return catalog
+
+
+def run_stream(stream_name: str, args: argparse.Namespace) -> dict:
+    """Sync one stream against the stand-in and measure it."""
+    config = {**MOCK_CONFIG, "page_size": args.page_size, **json.loads(args.config)}
+    adapter = ZohoMockAdapter(
+        records=args.records, line_items=args.line_items, latency=args.latency
+    )
+    with mock_zoho(adapter):
+        tap = TapZohoInventory(
+            config=config, catalog=catalog_selecting(config, stream_name)
+        )
+        adapter.calls.clear()
+        counter = _RecordCounter()
+        stdout, sys.stdout = sys.stdout, counter
+        start = time.perf_counter()
+        try:
+            tap.sync_streams()
+        finally:
+            sys.stdout = stdout
+        elapsed = time.perf_counter() - start
+    return {
+        "stream": stream_name,
+        "records": counter.records,
+        "seconds": round(elapsed, 3),
+        "requests": adapter.total_calls,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--line-items", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per simulated request"
+    )
+    parser.add_argument(
+        "--config", default="{}", help="JSON tap settings overriding the defaults"
+    )
+    parser.add_argument("--streams", nargs="*", help="streams to sync (default: all)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_stream(args.worker, args)))
+        return
+
+    with mock_zoho():
+        stream_names = args.streams or list(
+            TapZohoInventory(config=MOCK_CONFIG).streams
+        )
+    passthrough = [
+        f"--records={args.records}",
+        f"--line-items={args.line_items}",
+        f"--page-size={args.page_size}",
+        f"--latency={args.latency}",
+        f"--config={args.config}",
+    ]
+    print(
+        f"{'stream':<28}{'records':>9}{'seconds':>9}{'records/s':>11}"
+        f"{'req/record':>12}{'peak RSS MB':>13}"
+    )
+    for stream_name in stream_names:
+        # A fresh interpreter per stream keeps the peak RSS figures apart
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_streams", "--worker", stream_name]
+            + passthrough,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        records = result["records"]
+        print(
+            f"{stream_name:<28}{records:>9}{result['seconds']:>9.2f}"
+            f"{records / result['seconds'] if result['seconds'] else 0:>11.0f}"
+            f"{result['requests'] / records if records else 0:>12.3f}"
+            f"{result['peak_rss_mb']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,37 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
 from singer_sdk.authenticators import OAuthAuthenticator, SingletonMeta
 
 
 # The SingletonMeta metaclass makes your streams reuse the same authenticator instance.
 # If this behaviour interferes with your use-case, you can remove the metaclass.
 class ZohoInventoryAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
-    """Authenticator class for zoho-inventory."""
+    """Authenticator class for zoho-inventory.
+
+    The access token is refreshed ``token_refresh_margin`` seconds before it
+    expires: one thread refreshes it while the others keep using the current,
+    still valid, token. With ``token_cache_path`` set, the token is kept on disk
+    so the next run can reuse it until it expires.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._headers: dict | None = None
+        self._expires_at = 0.0
+
+    @property
+    def refresh_margin(self) -> float:
+        return self.config.get("token_refresh_margin", 300)
 
     @property
     def oauth_request_body(self) -> dict:
@@ -30,13 +54,90 @@ class ZohoInventoryAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
 
     @property
     def auth_headers(self) -> dict:
-        if not self.is_token_valid():
-            self.update_access_token()
+        headers = self._headers
+        if headers is not None and time.time() < self._expires_at - self.refresh_margin:
+            return headers
+        if headers is not None and self.is_token_valid():
+            # Expiring soon: refresh unless another thread already does, the
+            # current token is still good meanwhile.
+            if self._lock.acquire(blocking=False):
+                try:
+                    if time.time() >= self._expires_at - self.refresh_margin:
+                        self.update_access_token()
+                except Exception:
+                    self.logger.warning(
+                        "Could not refresh the access token ahead of its expiry",
+                        exc_info=True,
+                    )
+                finally:
+                    self._lock.release()
+            return self._headers
+        with self._lock:
+            if self._headers is None or not self.is_token_valid():
+                if not self._load_cached_token():
+                    self.update_access_token()
+            return self._headers
+
+    def is_token_valid(self) -> bool:
+        return self.access_token is not None and time.time() < self._expires_at
 
-        result = super().auth_headers
-        result["Authorization"] = f"Zoho-oauthtoken {self.access_token}"
+    def update_access_token(self) -> None:
+        requested_at = time.time()
+        super().update_access_token()
+        self._set_token(
+            self.access_token,
+            requested_at + self.expires_in if self.expires_in else math.inf,
+        )
+        self._write_cached_token()
+
+    def _set_token(self, access_token: str, expires_at: float) -> None:
+        self.access_token = access_token
+        self._expires_at = expires_at
+        headers = dict(self._auth_headers or {})
+        headers["Authorization"] = f"Zoho-oauthtoken {access_token}"
+        self._headers = headers
+
+    @property
+    def _token_owner(self) -> str:
+        """Identify the credentials a cached token was issued for."""
+        return hashlib.sha256(
+            f"{self.config['client_id']}:{self.config['refresh_token']}".encode()
+        ).hexdigest()
+
+    def _load_cached_token(self) -> bool:
+        cache_path = self.config.get("token_cache_path")
+        if not cache_path or not Path(cache_path).is_file():
+            return False
+        try:
+            cached = json.loads(Path(cache_path).read_text())
+        except ValueError:
+            self.logger.warning("Ignoring unreadable token cache %s", cache_path)
+            return False
+        if cached.get("owner") != self._token_owner or (
+            time.time() >= cached.get("expires_at", 0) - self.refresh_margin
+        ):
+            return False
+        self.logger.info("Using the access token cached in %s", cache_path)
+        self._set_token(cached["access_token"], cached["expires_at"])
+        return True
 
-        return result
+    def _write_cached_token(self) -> None:
+        cache_path = self.config.get("token_cache_path")
+        if not cache_path or math.isinf(self._expires_at):
+            return
+        content = json.dumps(
+            {
+                "owner": self._token_owner,
+                "access_token": self.access_token,
+                "expires_at": self._expires_at,
+            }
+        )
+        # Write then rename, so a concurrent run never reads half a file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, cache_path)
 
 
     @classmethod
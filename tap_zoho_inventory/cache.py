@@ -0,0 +1,128 @@
+"""Caches shared by zoho-inventory streams, during a run or across runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Hashable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class DetailCache:
+    """Detail documents handed from a parent stream to its child detail stream.
+
+    Entries are keyed by ``(resource, id)`` and removed when the child reads
+    them. Entries nobody reads (e.g. filtered parent records) are evicted oldest
+    first once ``max_entries`` is reached.
+
+    `UNCHANGED` tells the child that the document didn't change since it last
+    emitted it, see `ChangeIndex`.
+    """
+
+    UNCHANGED = object()
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a document."""
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any | None:
+        """Remove and return a document, or ``None`` if it isn't cached."""
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ChangeIndex:
+    """SQLite file of the records emitted by earlier runs.
+
+    Every emitted record is stored by stream and id with its modification time
+    and a digest of its content. Detail documents whose modification time
+    didn't change aren't requested again, and records identical to the ones
+    already emitted aren't written again.
+
+    New entries are committed once a STATE message follows the records, see
+    `commit`. The index assumes the target kept what earlier runs emitted:
+    delete the file to emit everything again.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.skipped_records: Counter = Counter()
+        self.skipped_details: Counter = Counter()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS emitted_records ("
+                " stream TEXT NOT NULL,"
+                " record_id TEXT NOT NULL,"
+                " modified TEXT,"
+                " digest TEXT NOT NULL,"
+                " PRIMARY KEY (stream, record_id)"
+                ") WITHOUT ROWID"
+            )
+
+    @staticmethod
+    def digest(record: dict) -> str:
+        """Return a digest of the content of a record."""
+        if orjson is not None:
+            data = orjson.dumps(record, option=orjson.OPT_SORT_KEYS, default=str)
+        else:
+            data = json.dumps(
+                record, sort_keys=True, separators=(",", ":"), default=str
+            ).encode()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _get(self, stream: str, record_id: str) -> tuple | None:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT modified, digest FROM emitted_records"
+                " WHERE stream = ? AND record_id = ?",
+                (stream, record_id),
+            ).fetchone()
+
+    def unchanged(self, stream: str, record_id: str, modified: str | None) -> bool:
+        """Return whether ``stream`` emitted the record as of ``modified``."""
+        entry = self._get(stream, record_id)
+        return modified is not None and entry is not None and entry[0] == modified
+
+    def emitted(self, stream: str, record_id: str, digest: str) -> bool:
+        """Return whether ``stream`` emitted a record identical to ``digest``."""
+        entry = self._get(stream, record_id)
+        return entry is not None and entry[1] == digest
+
+    def put(self, stream: str, record_id: str, modified: str | None, digest: str) -> None:
+        """Store an emitted record, until the next `commit`."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO emitted_records VALUES (?, ?, ?, ?)",
+                (stream, record_id, modified, digest),
+            )
+
+    def commit(self) -> None:
+        """Keep the records stored so far, once a STATE message follows them."""
+        with self._lock:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the file, dropping the records stored since the last commit."""
+        with self._lock:
+            self._connection.close()
@@ -2,21 +2,45 @@
 
 from __future__ import annotations
 
+import copy
+import json
+import queue
+import random
 import sys
+import threading
+import time
 import requests
 import backoff
-import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import timedelta, datetime, timezone
-from time import sleep
+from functools import lru_cache
 from pathlib import Path
 from pendulum import parse
 from typing import Any, Callable, Iterable, cast
+from urllib.parse import parse_qs, urlparse
 
+import singer_sdk._singerlib as singer
+from singer_sdk import metrics
+from singer_sdk._singerlib.messages import StateMessage, format_message
+from singer_sdk.helpers._state import finalize_state_progress_markers as finalize_bookmark
+from singer_sdk.helpers._typing import TypeConformanceLevel, _warn_unmapped_properties
+from singer_sdk.helpers._util import utc_now
 from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.pagination import BaseAPIPaginator  # noqa: TCH002
 from singer_sdk.streams import RESTStream
 from tap_zoho_inventory.auth import ZohoInventoryAuthenticator
-from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+from tap_zoho_inventory.cache import ChangeIndex, DetailCache
+from tap_zoho_inventory.conform import compile_conformer
+from tap_zoho_inventory.output import MessageWriter
+from tap_zoho_inventory.quota import DailyQuota
+from tap_zoho_inventory.streaming import StreamedPage
+from singer_sdk.exceptions import (
+    ConfigValidationError,
+    FatalAPIError,
+    RequestedAbortException,
+    RetriableAPIError,
+)
 
 
 if sys.version_info >= (3, 8):
@@ -24,14 +48,112 @@ if sys.version_info >= (3, 8):
 else:
     from cached_property import cached_property
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _Auth = Callable[[requests.PreparedRequest], requests.PreparedRequest]
 SCHEMAS_DIR = Path(__file__).parent / Path("./schemas")
 
 
+def json_loads(data: bytes) -> Any:
+    """Decode a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def load_schema(path: Path) -> dict:
+    """Return the parsed schema file at ``path``.
+
+    Schema files are parsed once per process. The returned dict is shared,
+    streams copy what they change.
+    """
+    return json_loads(Path(path).read_bytes())
+
+
+class _SyncStopped(RequestedAbortException):
+    """Raised in a stream tree synced in parallel once another one failed."""
+
+
+class _BackgroundIterator:
+    """Run an iterable on a daemon thread and hand its items over a bounded queue.
+
+    Exceptions raised by the producer, `BaseException` included, are re-raised in
+    the consuming thread: the producer always queues one last item, the end of
+    the items or its exception, so the consumer never waits on a dead thread.
+    The producer stops as soon as the consumer is closed.
+    """
+
+    _END = object()
+
+    class _Failure:
+        def __init__(self, exception: BaseException) -> None:
+            self.exception = exception
+
+    def __init__(self, iterable: Iterable, maxsize: int, name: str) -> None:
+        self._iterable = iterable
+        self._items: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name=name, daemon=True)
+
+    def start(self) -> _BackgroundIterator:
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop the producer, e.g. when the consumer stops before the last item."""
+        self._stop.set()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._items.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        last = self._END
+        try:
+            for item in self._iterable:
+                if not self._put(item):
+                    # Release what the iterable holds, e.g. a streamed response
+                    getattr(self._iterable, "close", lambda: None)()
+                    return
+        except BaseException as ex:
+            last = self._Failure(ex)
+        finally:
+            # Returns at once if the consumer is closed
+            self._put(last)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self._items.get()
+                if item is self._END:
+                    return
+                if isinstance(item, self._Failure):
+                    raise item.exception
+                yield item
+        finally:
+            self._stop.set()
+
+
 class ZohoInventoryStream(RESTStream):
     """ZohoInventory stream class."""
-    custom_fields_list = []
+
+    # API names of the custom fields promoted to the root of the records
+    promoted_custom_fields: frozenset = frozenset()
+
     def _get_custom_fields(self):
+        # The preferences are shared by every stream, the tap fetches them once
+        return self._tap.get_custom_fields(self)
+
+    def _fetch_custom_fields(self):
         # Gets all of the custom fields from the account preferences
         url = self.url_base + "/settings/preferences/"
         decorated_request = self.request_decorator(self._request)
@@ -40,24 +162,39 @@ class ZohoInventoryStream(RESTStream):
             params['organization_id'] = self.config.get("organization_id")
         response = decorated_request(self.prepare_request_lines(url=url,params=params), context={})
         if response.status_code == 401:
-            return {}
-        custom_fields = response.json()["customfields"]
+            return None
+        custom_fields = self.decode_response(response)["customfields"]
         return custom_fields
 
     def __init__(self, tap, name=None, schema=None, path=None):
-        super().__init__(tap, name, schema, path)
+        if schema is None and self.schema_filepath:
+            # The parsed schema file is shared by every instance of the stream,
+            # hide the path so the SDK doesn't read and parse the file again.
+            schema = load_schema(self.schema_filepath)
+            self.schema_filepath = None
+        try:
+            super().__init__(tap, name, schema, path)
+        finally:
+            self.__dict__.pop("schema_filepath", None)
+        self._starting_times = {}
+        self._local = threading.local()
+        self._window_producers = {}
+        self._records_since_checkpoint = 0
         if getattr(self, "custom_fields_key", None):
-            custom_fields = self._get_custom_fields()
-            for c_f in custom_fields.get(self.custom_fields_key, []):
-                self.custom_fields_list.append(c_f["api_name"])
-                # TODO: c_f["data_type"] is not always a valid JSON Schema type.
-                # We can either map all Zoho Types to valid JSON schema types or force all custom fields to come as string
-                # Zoho Types: https://www.zoho.com/deluge/help/datatypes.html
-                self.schema["properties"][c_f["api_name"]] = {
-                    "type": list(set(["string", "object", "null"])) # set => list approach to remove duplicates
-                }
-
-            self._schema = self.schema
+            custom_fields = self._get_custom_fields().get(self.custom_fields_key, [])
+            self.promoted_custom_fields = frozenset(c_f["api_name"] for c_f in custom_fields)
+            if custom_fields:
+                # Only the two levels being extended are copied, the property
+                # schemas stay shared with the cached schema file.
+                properties = dict(self.schema["properties"])
+                for c_f in custom_fields:
+                    # TODO: c_f["data_type"] is not always a valid JSON Schema type.
+                    # We can either map all Zoho Types to valid JSON schema types or force all custom fields to come as string
+                    # Zoho Types: https://www.zoho.com/deluge/help/datatypes.html
+                    properties[c_f["api_name"]] = {
+                        "type": list(set(["string", "object", "null"])) # set => list approach to remove duplicates
+                    }
+                self._schema = {**self.schema, "properties": properties}
 
     @property
     def url_base(self) -> str:
@@ -72,15 +209,41 @@ class ZohoInventoryStream(RESTStream):
     # Set this value or override `get_new_paginator`.
     next_page_token_jsonpath = "$.page_context.page"  # noqa: S105
 
+    def decode_response(self, response: requests.Response) -> Any:
+        """Return the decoded JSON body of a response.
+
+        The body is decoded once and kept on the response, so the paginator and
+        `parse_response` share the same payload. Of a streamed list page, only
+        the members other than the records are kept, plus the last record, see
+        `StreamedPage`.
+        """
+        try:
+            return response._zoho_payload
+        except AttributeError:
+            pass
+        page = getattr(response, "_zoho_page", None)
+        if page is not None:
+            return page.finish()
+        response._zoho_payload = json_loads(response.content)
+        return response._zoho_payload
+
     def get_next_page_token(self, response, previous_token: Any | None) -> Any | None:
+        res = self.decode_response(response)
         try:
-            more_pages = response.json()['page_context']['has_more_page']
+            more_pages = res['page_context']['has_more_page']
         except KeyError:
             return None
 
         if self.next_page_token_jsonpath and more_pages:
+            window_end = self._window_end()
+            if window_end is not None:
+                # Pages are sorted by last_modified_time, the rest of the
+                # window's records can't be on a later page.
+                records = self._page_records(res)
+                if records and parse(records[-1][self.replication_key]) > window_end:
+                    return None
             all_matches = extract_jsonpath(
-                self.next_page_token_jsonpath, response.json()
+                self.next_page_token_jsonpath, res
             )
             first_match = next(iter(all_matches), None)
             next_page_token = first_match
@@ -88,6 +251,13 @@ class ZohoInventoryStream(RESTStream):
 
         return None
 
+    def _page_records(self, res):
+        """Return the records of a decoded list page."""
+        lookup_name = res['page_context']['report_name'].lower().replace(' ', '')
+        if isinstance(res.get(lookup_name), list):
+            return res[lookup_name]
+        return next((value for value in res.values() if isinstance(value, list)), [])
+
     def _handle_rate_limit(self, response):
         """Handle rate limit response by extracting information and backing off appropriately."""
         retry_after = response.headers.get('Retry-After')
@@ -104,13 +274,75 @@ class ZohoInventoryStream(RESTStream):
                     now = datetime.now(timezone.utc)
                     sleep_time = max(1, int((retry_date - now).total_seconds()))
                 except (ValueError, TypeError):
-                    self.logger.warning(f"Could not parse Retry-After header: {retry_after}")
+                    self.logger.warning("Could not parse Retry-After header: %s", retry_after)
             
-        self.logger.info(f"Rate limit hit. Backing off for {sleep_time} seconds.")
-        time.sleep(sleep_time)
-        
+        self.logger.info("Rate limit hit. Backing off for %s seconds.", sleep_time)
+        self.rate_limiter.pause(sleep_time)
+
+    # Waits between retries of a failed request: 6s, 18s, 54s... up to 5 min,
+    # with full jitter.
+    retry_base_wait = 6
+    retry_max_wait = 300
+
+    def request_decorator(self, func: Callable) -> Callable:
+        """Retry failed requests within the tap's retry budget.
+
+        Same as the SDK's decorator, with the jitter applied by
+        `backoff_wait_generator` and a `giveup` check on the retry budget.
+        backoff asks `giveup` before it checks ``max_tries``, so the retry is
+        only taken from the budget in `backoff_handler`, once it happens.
+        """
+        return backoff.on_exception(
+            self.backoff_wait_generator,
+            (
+                ConnectionResetError,
+                RetriableAPIError,
+                requests.exceptions.ReadTimeout,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ContentDecodingError,
+            ),
+            max_tries=self.backoff_max_tries,
+            giveup=self._retry_budget_exhausted,
+            on_backoff=self.backoff_handler,
+            jitter=None,
+        )(func)
+
     def backoff_wait_generator(self):
-        return backoff.expo(base=3, factor=6)
+        """Yield the wait before each retry, given the exception that failed it.
+
+        A 429 already paused the shared rate limiter for the ``Retry-After`` the
+        server asked for (see `_handle_rate_limit`), and the retried request
+        waits for it in `_request`. Backing off on top of that would honour the
+        hint twice, so throttled requests only wait a second of jitter here.
+        Other failures back off exponentially. Either way the wait happens in
+        the thread sending the request, other detail fetches carry on.
+        """
+        attempt = 0
+        exception = yield
+        while True:
+            response = getattr(exception, "response", None)
+            if response is not None and response.status_code == 429:
+                wait = random.uniform(0, 1)
+            else:
+                wait = random.uniform(
+                    0, min(self.retry_max_wait, self.retry_base_wait * 3**attempt)
+                )
+                attempt += 1
+            exception = yield wait
+
+    def _retry_budget_exhausted(self, exception: Exception) -> bool:
+        if self._tap.retry_budget.has_retry():
+            return False
+        self._log_retry_budget_exhausted()
+        return True
+
+    def _log_retry_budget_exhausted(self) -> None:
+        self.logger.error(
+            "Stream '%s': the retry budget of %d retries is exhausted, giving up",
+            self.name,
+            self._tap.retry_budget.max_retries,
+        )
 
     @cached_property
     def authenticator(self) -> _Auth:
@@ -139,11 +371,84 @@ class ZohoInventoryStream(RESTStream):
         return headers
 
     def get_starting_time(self, context):
+        # The bookmark doesn't move while a context syncs, parse it only once
+        cache_key = tuple(sorted((context or {}).items()))
+        if cache_key in self._starting_times:
+            return self._starting_times[cache_key]
         start_date = self.config.get("start_date")
         if start_date:
             start_date = parse(self.config.get("start_date"))
-        rep_key = self.get_starting_timestamp(context)
-        return rep_key or start_date
+        starting_time = self.get_starting_timestamp(context) or start_date
+        if context and "window_start" in context:
+            window_start = parse(context["window_start"])
+            # A bookmark left before the stream was split into windows
+            stream_bookmark = self.stream_state.get("replication_key_value")
+            if stream_bookmark:
+                window_start = max(window_start, parse(stream_bookmark))
+            starting_time = max(starting_time or window_start, window_start)
+        self._starting_times[cache_key] = starting_time
+        return starting_time
+
+    # Whether `backfill_window_days` splits the stream into date windows
+    backfill_windows = False
+
+    @cached_property
+    def _date_windows(self) -> list[dict] | None:
+        """Return the date windows still to sync between start_date and now, if enabled.
+
+        Windows are aligned on start_date so their contexts, and the bookmarks
+        stored for them, stay the same from one run to the next. Windows synced
+        entirely after they ended are done, see `_get_window_records`, and so
+        are the windows before a bookmark the stream had before it was split:
+        only the others are requested.
+        """
+        window_days = self.config.get("backfill_window_days")
+        start_date = self.config.get("start_date")
+        if not (self.backfill_windows and window_days and start_date):
+            return None
+        done = {
+            partition["context"]["window_start"]
+            for partition in self.stream_state.get("partitions", [])
+            if partition.get("window_done") and "window_start" in partition.get("context", {})
+        }
+        stream_bookmark = self.stream_state.get("replication_key_value")
+        windows = []
+        window_start = parse(start_date)
+        self._windows_listed_at = datetime.now(timezone.utc)
+        while window_start < self._windows_listed_at:
+            window_end = window_start + timedelta(days=window_days)
+            window = {
+                "window_start": window_start.isoformat(),
+                "window_end": window_end.isoformat(),
+            }
+            window_start = window_end
+            if window["window_start"] in done or (
+                stream_bookmark and window_end <= parse(stream_bookmark)
+            ):
+                continue
+            windows.append(window)
+        return windows
+
+    @property
+    def partitions(self) -> list[dict] | None:
+        return self._date_windows or super().partitions
+
+    def _window_end(self):
+        """Return the end of the date window being requested by this thread."""
+        context = getattr(self._local, "context", None)
+        if context and "window_end" in context:
+            return parse(context["window_end"])
+        return None
+
+    def _drop_beyond_window(self, records):
+        """Drop the records modified after the current window, they belong to a later one."""
+        window_end = self._window_end()
+        if window_end is None:
+            return records
+        return [
+            record for record in records
+            if parse(record[self.replication_key]) <= window_end
+        ]
 
     def get_url_params(
         self,
@@ -164,6 +469,8 @@ class ZohoInventoryStream(RESTStream):
             params['organization_id'] = self.config.get('organization_id')
         if next_page_token:
             params["page"] = next_page_token
+        if self.config.get("page_size") and not self._detail_resource:
+            params["per_page"] = self.config.get("page_size")
         if self.replication_key:
             params["sort_order"] = "A"
             params["sort_column"] = self.replication_key
@@ -171,7 +478,7 @@ class ZohoInventoryStream(RESTStream):
             if start_date:
                 start_date = start_date + timedelta(seconds=1)
                 params[self.replication_key] = start_date.strftime('%Y-%m-%dT%H:%M:%S%z')
-        self.logger.info(f"Stream '{self.name}': Preparing request with parameters: {params}")
+        self.logger.debug("Stream '%s': Preparing request with parameters: %s", self.name, params)
         return params
 
     def prepare_request_payload(
@@ -198,16 +505,197 @@ class ZohoInventoryStream(RESTStream):
         This function allows the parse_response method to have the custom_fields
         on the root of the object, if the custom_field is mapped to the root of the schema.
         """
-        custom_fields = record.get("custom_fields", [])
+        custom_fields = record.get("custom_fields") or []
+        promoted = self.promoted_custom_fields
+        if not promoted:
+            record["custom_fields"] = custom_fields
+            return record
         new_custom_fields_list = []
         for c_f in custom_fields:
-            if c_f["api_name"] in self.custom_fields_list:
+            if c_f["api_name"] in promoted:
                 record[c_f["api_name"]] = str(c_f["value"])
             else:
                 new_custom_fields_list.append(c_f)
         record["custom_fields"] = new_custom_fields_list
         return record
 
+    def request_records(self, context: dict | None) -> Iterable[dict]:
+        """Request records, optionally fetching the next pages in the background.
+
+        With ``prefetch_pages`` set, up to that many list pages are requested
+        ahead while the records of the current page are processed. The page and
+        offset reached are checkpointed in the state, see `_save_checkpoint`.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            An item for every record in the response.
+        """
+        yield from self._checkpointed(context, self._request_positioned_records(context))
+
+    def _request_positioned_records(self, context: dict | None) -> Iterable[tuple]:
+        """Yield every record with the page it is on and its offset in the page,
+        resuming from the checkpoint of the context if there is one.
+
+        Only the thread emitting the records saves checkpoints, see
+        `request_records`, so this may run ahead in the background.
+        """
+        # parse_response and get_next_page_token don't receive the context
+        self._local.context = context
+        checkpoint = self._load_checkpoint(context) if self._checkpoints_enabled else None
+        if checkpoint:
+            self.logger.info(
+                "Stream '%s': resuming from page %s, record %s",
+                self.name,
+                checkpoint["page"],
+                checkpoint["offset"],
+            )
+        self._local.resume = checkpoint
+
+        pages = self._iter_pages(context, start_page=checkpoint and checkpoint["page"])
+        depth = self.config.get("prefetch_pages", 0)
+        # Child streams sync one context per parent record, a thread for each
+        # would outnumber the pages they save
+        if depth and not self.parent_stream_type:
+            pages = _BackgroundIterator(
+                pages, maxsize=depth, name=f"{self.name}-prefetch"
+            ).start()
+        try:
+            yield from self._positioned_records(context, pages)
+        finally:
+            if isinstance(pages, _BackgroundIterator):
+                pages.close()
+
+    def _positioned_records(self, context: dict | None, pages: Iterable) -> Iterable[tuple]:
+        """Yield every record of the pages with its page number and offset."""
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            for page_number, page in enumerate(pages, start=1):
+                request_counter.increment()
+                if hasattr(page, "_zoho_page"):
+                    # The page context comes after the records, use the page requested
+                    page_number = int(
+                        parse_qs(urlparse(page.request.url).query).get("page", [1])[0]
+                    )
+                else:
+                    page_number = self.decode_response(page).get(
+                        "page_context", {}
+                    ).get("page", page_number)
+                self._local.skipped = 0
+                for offset, record in enumerate(self.parse_response(page), start=1):
+                    yield record, page_number, self._local.skipped + offset
+
+    def _iter_pages(self, context, start_page=None):
+        """Request the list pages of a context one after the other."""
+        self._local.context = context
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request)
+        while not paginator.finished:
+            if self._tap.stop_syncing.is_set():
+                raise _SyncStopped(f"Stream '{self.name}': stopped, another stream failed")
+            prepared_request = self.prepare_request(
+                context,
+                next_page_token=paginator.current_value if paginator.count else start_page,
+            )
+            response = decorated_request(
+                prepared_request, context, stream=self._stream_pages
+            )
+            self.update_sync_costs(prepared_request, response, context)
+            page = getattr(response, "_zoho_page", None)
+            if page is None:
+                paginator.advance(response)
+                yield response
+                continue
+            # The next page is only known once the records of this one are read
+            try:
+                yield response
+                paginator.advance(response)
+                if "Content-Length" not in response.headers:
+                    self.sync_metrics.observe_bytes(
+                        self.name, self._endpoint_path(response), page.bytes_read
+                    )
+            finally:
+                response.close()
+
+    # Whether the pagination of the stream only needs the page context and the
+    # last record of a page, so its list pages can be streamed
+    streamable_pages = True
+
+    @cached_property
+    def _stream_pages(self) -> bool:
+        """Return whether list pages are decoded while they download."""
+        if (
+            not self.config.get("stream_list_pages")
+            or not self.streamable_pages
+            or self._detail_resource
+        ):
+            return False
+        if self.config.get("prefetch_pages"):
+            raise ConfigValidationError(
+                "stream_list_pages can't be combined with prefetch_pages, the next "
+                "page is only known once the records of the current one are read."
+            )
+        return True
+
+    # Incremental parents sorted by their replication key can resume mid-page
+    checkpoint_pages = True
+
+    @property
+    def _checkpoints_enabled(self) -> bool:
+        return bool(
+            self.checkpoint_pages
+            and self.replication_key
+            and not self.parent_stream_type
+            and self.config.get("checkpoint_interval", 100)
+        )
+
+    def _load_checkpoint(self, context):
+        with self._tap.output_lock:
+            return copy.copy(self.get_context_state(context).get("checkpoint"))
+
+    def _save_checkpoint(self, context, page, offset, record):
+        """Record the page and offset reached, writing a STATE message every
+        ``checkpoint_interval`` records."""
+        with self._tap.output_lock:
+            state = self.get_context_state(context)
+            state["checkpoint"] = {
+                "page": page,
+                "offset": offset,
+                "replication_key_value": record.get(self.replication_key),
+            }
+            self._is_state_flushed = False
+            self._records_since_checkpoint += 1
+            if self._records_since_checkpoint >= self.config.get("checkpoint_interval", 100):
+                self._records_since_checkpoint = 0
+                self._write_state_message()
+
+    def _clear_checkpoint(self, context):
+        with self._tap.output_lock:
+            self.get_context_state(context).pop("checkpoint", None)
+            # Make sure the final STATE message goes out without the checkpoint
+            self._is_state_flushed = False
+
+    def _skip_checkpointed(self, records):
+        """Drop the records emitted before the run that left the checkpoint died.
+
+        Only leading records of the resumed page are dropped, and only while their
+        replication key hasn't moved past the checkpoint.
+        """
+        checkpoint = getattr(self._local, "resume", None)
+        if not checkpoint:
+            return records
+        self._local.resume = None
+        last_value = checkpoint.get("replication_key_value")
+        skipped = 0
+        for record in records[: checkpoint["offset"]]:
+            value = record.get(self.replication_key)
+            if last_value is None or value is None or parse(value) > parse(last_value):
+                break
+            skipped += 1
+        self._local.skipped = skipped
+        return records[skipped:]
+
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         """Parse the response and return an iterator of result records.
 
@@ -217,50 +705,447 @@ class ZohoInventoryStream(RESTStream):
         Yields:
             Each record from the source.
         """
-        decorated_request = self.request_decorator(self._request)
-        res = response.json()
+        page = getattr(response, "_zoho_page", None)
+        if page is not None:
+            # Streamed list page: the records are handled a batch at a time
+            # while the rest of the page downloads.
+            first = page.first()
+            lookup_name = page.list_key
+            id_field = None
+            if first is not None:
+                id_field = next((x for x in first if x.endswith('_id')), None)
+            batches = self._streamed_batches(page)
+        else:
+            res = self.decode_response(response)
+            lookup_name, id_field = self._lookup_name_and_id_field(res)
+            if getattr(self, "has_lines", True) and id_field:
+                batches = [res[lookup_name]]
+            else:
+                batches = [list(extract_jsonpath(self.records_jsonpath, input=res))]
+
+        # Only keep a copy of the detail documents a selected child stream
+        # is going to read, see `get_records`.
+        share_details = lookup_name in self._child_detail_resources
+        if not self.selected:
+            # Ids-only mode: the stream only runs for its children, which fetch
+            # what they need themselves unless they read the details shared below,
+            # or learn which details they already emitted.
+            if not (
+                id_field
+                and share_details
+                and (
+                    getattr(self, "has_lines", True)
+                    or self.bulk_detail_path
+                    or self.change_index is not None
+                )
+            ):
+                if page is None:
+                    batches = [list(extract_jsonpath(self.records_jsonpath, input=res))]
+                for records in batches:
+                    yield from self._skip_checkpointed(self._drop_beyond_window(records))
+                return
+
+        for records in batches:
+            records = self._skip_checkpointed(self._drop_beyond_window(records))
+            yield from self._parse_records(lookup_name, id_field, share_details, records)
+
+    def _lookup_name_and_id_field(self, res):
+        """Return the key of the records in a decoded list page, and their id field."""
         lookup_name = res['page_context']['report_name'].lower().replace(' ', '')
+        id_field = None
         try:
             id_field = [x for x in res[lookup_name][0].keys() if x.endswith('_id')][0]
         except IndexError:
-            self.logger.info(f'No id field found for {lookup_name}')
-            self.logger.info(f"Got response: {res}")
+            # Fires on every empty page, keep the payload out of INFO logs
+            self.logger.debug("No id field found for %s", lookup_name)
+            self.logger.debug("Got response: %s", res)
             id_field = lookup_name if not lookup_name.endswith('s') else lookup_name[:-1]
             id_field = f'{id_field}_id'
-            self.logger.info(f"Using {id_field} as id field")
+            self.logger.debug("Using %s as id field", id_field)
         except KeyError:
-            self.logger.info(f"Could not find {lookup_name} in response, falling back on url part")
-            for key, value in response.json().items():
+            self.logger.debug("Could not find %s in response, falling back on url part", lookup_name)
+            for key, value in res.items():
                 if isinstance(value, list):
                     lookup_name = key
                     try:
                         id_field = [x for x in value[0].keys() if x.endswith('_id')][0]
                     except:
-                        self.logger.info("Could not find id field in response, ignoring details")
+                        self.logger.debug("Could not find id field in response, ignoring details")
                         id_field = None
                     break
+        return lookup_name, id_field
 
+    def _parse_records(self, lookup_name, id_field, share_details, records):
+        """Yield the records of a page, or of a batch of a streamed page."""
+        detail_key = self._detail_key(lookup_name, id_field)
         if getattr(self, "has_lines", True) and id_field:
-            for record in response.json()[lookup_name]:
-                sleep(1)
-                try:
-                    url = self.url_base + "/" + lookup_name + f"/{record[id_field]}"
-                    params = {}
-                    if self.config.get("organization_id") is not None:
-                        params['organization_id'] = self.config.get("organization_id")
-                    response_obj = decorated_request(self.prepare_request_lines(url,params), {})
-                    detailed_record = list(extract_jsonpath(self.records_jsonpath, input=response_obj.json()))[0]
-                    detailed_record = self.move_custom_fields_to_root(detailed_record)
-                    yield detailed_record
-                except:
-                    self.logger.info(f"Could not get lines for {self.name} with record {record}")
-                    record = self.move_custom_fields_to_root(record)
-                    yield record
+            records = self._drop_unchanged(lookup_name, detail_key, share_details, records)
+            # Detail documents are fetched concurrently but handed back in page
+            # order, so the replication key keeps increasing.
+            details = self._fetch_details(lookup_name, detail_key, records)
+            for record, detailed_record in zip(records, details):
+                if detailed_record is None:
+                    yield self.move_custom_fields_to_root(record)
+                    continue
+                if share_details:
+                    self.detail_cache.put(
+                        (lookup_name, str(record[detail_key])),
+                        copy.deepcopy(detailed_record),
+                    )
+                yield self.move_custom_fields_to_root(detailed_record)
         else:
-            for record in extract_jsonpath(self.records_jsonpath, input=response.json()):
+            detailed = records
+            if id_field and share_details:
+                detailed = self._mark_unchanged_details(lookup_name, detail_key, records)
+            if id_field and share_details and self.bulk_detail_path:
+                # The list records don't need their details, but the child
+                # detail stream does: fetch them in bulk rather than one by one.
+                bulk_details = self._fetch_bulk_details(detail_key, detailed)
+                for record, detailed_record in zip(detailed, bulk_details):
+                    if detailed_record is not None:
+                        self.detail_cache.put(
+                            (lookup_name, str(record[detail_key])), detailed_record
+                        )
+            for record in records:
                 record = self.move_custom_fields_to_root(record)
                 yield record
 
+    # Field telling when a record last changed, see `ChangeIndex`
+    modified_field = "last_modified_time"
+
+    @property
+    def change_index(self) -> ChangeIndex | None:
+        """Return the index of the records emitted by earlier runs, if enabled."""
+        return self._tap.change_index
+
+    def _drop_unchanged(self, lookup_name, id_field, share_details, records):
+        """Drop the records whose detail document every stream reading it
+        already emitted as of the record's modification time."""
+        index = self.change_index
+        if index is None:
+            return records
+        readers = [self.name] if self.selected else []
+        if share_details:
+            readers.append(self._child_detail_resources[lookup_name].name)
+        changed = [
+            record
+            for record in records
+            if not all(
+                index.unchanged(
+                    reader, str(record[id_field]), record.get(self.modified_field)
+                )
+                for reader in readers
+            )
+        ]
+        index.skipped_details[self.name] += len(records) - len(changed)
+        return changed
+
+    def _mark_unchanged_details(self, lookup_name, id_field, records):
+        """Tell the child detail stream which detail documents it already emitted.
+
+        Returns:
+            The records whose detail document must be fetched.
+        """
+        index = self.change_index
+        if index is None:
+            return records
+        child = self._child_detail_resources[lookup_name]
+        changed = []
+        for record in records:
+            record_id = str(record[id_field])
+            if index.unchanged(child.name, record_id, record.get(self.modified_field)):
+                self.detail_cache.put((lookup_name, record_id), DetailCache.UNCHANGED)
+            else:
+                changed.append(record)
+        index.skipped_details[child.name] += len(records) - len(changed)
+        return changed
+
+    @cached_property
+    def _record_id_fields(self) -> list[str]:
+        """Return the path parameters of the detail stream of this stream's records."""
+        detail_resources = [self._detail_resource] + [
+            getattr(child, "_detail_resource", None) for child in self.child_streams
+        ]
+        return [resource[1] for resource in detail_resources if resource]
+
+    def _record_id(self, record: dict) -> str | None:
+        """Return the id of a record: the path parameter of its detail stream,
+        see `_detail_key`, or else its first ``*_id`` field."""
+        for field in self._record_id_fields:
+            if field in record:
+                return str(record[field])
+        field = next((key for key in record if key.endswith("_id")), None)
+        return None if field is None else str(record[field])
+
+    def _streamed_batches(self, page: StreamedPage) -> Iterable[list]:
+        """Split the records of a streamed page into batches detailed together.
+
+        The first batch holds at least the records a resumed run skips, see
+        `_skip_checkpointed`.
+        """
+        size = max(self.bulk_detail_batch_size, 2 * self.detail_concurrency)
+        resume = getattr(self._local, "resume", None)
+        records = iter(page)
+        batch = list(islice(records, max(size, resume["offset"]) if resume else size))
+        while batch:
+            yield batch
+            batch = list(islice(records, size))
+
+    # Endpoint returning the detail documents of several records at once, e.g.
+    # `/itemdetails?item_ids=1,2,3`, and the query parameter taking the ids.
+    bulk_detail_path: str | None = None
+    bulk_detail_param: str | None = None
+    bulk_detail_batch_size = 25
+
+    def _fetch_details(self, lookup_name, id_field, records):
+        """Yield the detail document of every record, or ``None``, in page order.
+
+        Documents are fetched in bulk when the stream has a bulk endpoint, the
+        ones it doesn't return are then requested one by one.
+        """
+        if self.bulk_detail_path:
+            details = self._fetch_bulk_details(id_field, records)
+        else:
+            details = [None] * len(records)
+        missing = [record for record, detail in zip(records, details) if detail is None]
+        if not missing:
+            yield from details
+            return
+        with ThreadPoolExecutor(max_workers=self.detail_concurrency) as executor:
+            fetched = executor.map(
+                lambda record: self._fetch_detail(lookup_name, id_field, record),
+                missing,
+            )
+            for detail in details:
+                yield next(fetched) if detail is None else detail
+
+    def _fetch_bulk_details(self, id_field, records) -> list:
+        """Return the detail documents of the records fetched from the bulk
+        endpoint, ``None`` for the ones it didn't return."""
+        ids = [str(record[id_field]) for record in records]
+        found = {}
+        size = self.bulk_detail_batch_size
+        for start in range(0, len(ids), size):
+            if not self.bulk_detail_path:
+                break
+            found.update(self._request_bulk_details(id_field, ids[start : start + size]))
+        return [found.get(record_id) for record_id in ids]
+
+    def _request_bulk_details(self, id_field, ids) -> dict:
+        params = {self.bulk_detail_param: ",".join(ids)}
+        if self.config.get("organization_id") is not None:
+            params["organization_id"] = self.config.get("organization_id")
+        decorated_request = self.request_decorator(self._request)
+        try:
+            response = decorated_request(
+                self.prepare_request_lines(self.url_base + self.bulk_detail_path, params),
+                {},
+            )
+        except FatalAPIError as ex:
+            self.logger.warning(
+                "Stream '%s': bulk endpoint %s failed (%s), fetching details one by one",
+                self.name,
+                self.bulk_detail_path,
+                ex,
+            )
+            # Don't try again for every page
+            self.bulk_detail_path = None
+            return {}
+        res = self.decode_response(response)
+        documents = next((value for value in res.values() if isinstance(value, list)), [])
+        return {
+            str(document[id_field]): document
+            for document in documents
+            if id_field in document
+        }
+
+    @property
+    def detail_concurrency(self) -> int:
+        """Return the number of detail documents fetched in parallel."""
+        return max(1, int(self.config.get("detail_concurrency", 4)))
+
+    @property
+    def detail_cache(self) -> DetailCache:
+        """Return the detail documents shared between parent and child streams."""
+        return self._tap.detail_cache
+
+    @property
+    def _detail_resource(self) -> tuple[str, str] | None:
+        """Return the resource and context key of a `/{resource}/{id}` path."""
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[1].startswith("{") and parts[1].endswith("}"):
+            return parts[0], parts[1][1:-1]
+        return None
+
+    def _detail_key(self, lookup_name, id_field):
+        """Return the field of the list records holding the id their detail
+        documents are requested with.
+
+        That's the path parameter of the child detail stream of the resource,
+        e.g. ``item_id`` for `/items/{item_id}`: the first ``*_id`` field of the
+        records isn't always it, list rows of grouped items start with
+        ``group_id``.
+        """
+        for child in self.child_streams:
+            detail_resource = getattr(child, "_detail_resource", None)
+            if detail_resource and detail_resource[0] == lookup_name:
+                return detail_resource[1]
+        return id_field
+
+    @property
+    def _child_detail_resources(self) -> dict[str, ZohoInventoryStream]:
+        """Return the selected child detail streams by the resource they fetch."""
+        return {
+            child._detail_resource[0]: child
+            for child in self.child_streams
+            if child.selected and getattr(child, "_detail_resource", None)
+        }
+
+    def _fetch_detail(self, lookup_name, id_field, record):
+        """Fetch the detail document of a list record.
+
+        Returns ``None`` if the detail can't be retrieved, unless the retry
+        budget ran out: the sync then fails rather than dropping every detail
+        left to fetch.
+        """
+        decorated_request = self.request_decorator(self._request)
+        try:
+            url = self.url_base + "/" + lookup_name + f"/{record[id_field]}"
+            params = {}
+            if self.config.get("organization_id") is not None:
+                params['organization_id'] = self.config.get("organization_id")
+            response_obj = decorated_request(self.prepare_request_lines(url,params), {})
+            return list(extract_jsonpath(self.records_jsonpath, input=self.decode_response(response_obj)))[0]
+        except Exception:
+            if self._tap.retry_budget.exhausted:
+                raise
+            self.logger.warning(
+                "Could not get lines for %s with %s %s",
+                self.name,
+                id_field,
+                record.get(id_field),
+            )
+            self.logger.debug("Record without lines: %s", record, exc_info=True)
+            return None
+
+    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        """Return records, reusing the detail document fetched by the parent stream.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            Each record from the source.
+        """
+        yield from self._get_context_records(context)
+        self._finalize_context_state(context)
+
+    def _finalize_context_state(self, context: dict | None) -> None:
+        """Finalize the bookmarks of a context whose records are all synced.
+
+        The SDK does it too once `get_records` returns, without taking the
+        output lock while parallel streams may be serializing the state. It
+        then finds nothing left to change.
+        """
+        with self._tap.output_lock:
+            if context is None or self._get_state_partition_context(context) == context:
+                finalize_bookmark(self.get_context_state(context))
+            # The stream itself is done with its last date window
+            windows = self._date_windows
+            if context is None or (windows and context == windows[-1]):
+                finalize_bookmark(self.stream_state)
+
+    def _get_context_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        detail_resource = self._detail_resource
+        if context and detail_resource and detail_resource[1] in context:
+            cache_key = (detail_resource[0], str(context[detail_resource[1]]))
+            detailed_record = self.detail_cache.pop(cache_key)
+            if detailed_record is DetailCache.UNCHANGED:
+                # Already emitted by an earlier run, see `_mark_unchanged_details`
+                return
+            if detailed_record is not None:
+                record = self.post_process(
+                    self.move_custom_fields_to_root(detailed_record), context
+                )
+                if record is not None:
+                    yield record
+                return
+        if context and "window_start" in context:
+            yield from self._get_window_records(context)
+            return
+        yield from super().get_records(context)
+
+    def _get_window_records(self, context: dict) -> Iterable[dict[str, Any]]:
+        """Return the records of a date window.
+
+        The SDK syncs partitions one after the other, so the following
+        ``backfill_workers - 1`` windows are requested in the background while
+        this one is emitted.
+        """
+        windows = self._date_windows or []
+        workers = self.config.get("backfill_workers", 1)
+        position = windows.index(context) if context in windows else len(windows)
+        for window in windows[position + 1 : position + workers]:
+            window_key = window["window_start"]
+            if window_key not in self._window_producers:
+                self._window_producers[window_key] = _BackgroundIterator(
+                    self._iter_window(window),
+                    maxsize=self.config.get("page_size") or 200,
+                    name=f"{self.name}-{window_key}",
+                ).start()
+
+        producer = self._window_producers.pop(context["window_start"], None)
+        if producer is None:
+            records = self.request_records(context)
+        else:
+            records = self._checkpointed(context, producer)
+        for record in records:
+            record = self.post_process(record, context)
+            if record is not None:
+                yield record
+
+        # Record the window as done now: the next windows may already be
+        # fetched and a crash shouldn't send the next run back to this one.
+        with self._tap.output_lock:
+            state = self.get_context_state(context)
+            self.finalize_state_progress_markers(state)
+            if parse(context["window_end"]) <= self._windows_listed_at:
+                # Requested after it ended, nothing can change in it any more
+                state["window_done"] = True
+            self._is_state_flushed = False
+            self._write_state_message()
+
+    def _sync_records(self, context: dict | None = None, *, write_messages: bool = True):
+        """Sync the records, stopping the windows still fetched ahead once done.
+
+        They are left over when the sync fails or is cut short, e.g. by a dry
+        run's record limit.
+        """
+        try:
+            yield from super()._sync_records(context, write_messages=write_messages)
+        finally:
+            producers = list(self._window_producers.values())
+            self._window_producers.clear()
+            for producer in producers:
+                producer.close()
+
+    def _checkpointed(self, context: dict, positioned_records: Iterable[tuple]):
+        """Yield the records, checkpointing their position as they are emitted."""
+        checkpointing = self._checkpoints_enabled
+        for record, page_number, offset in positioned_records:
+            yield record
+            # The SDK has emitted the record once it asks for the next one
+            if checkpointing:
+                self._save_checkpoint(context, page_number, offset, record)
+        if checkpointing:
+            self._clear_checkpoint(context)
+
+    def _iter_window(self, window: dict) -> Iterable[tuple]:
+        """Request the records of a window ahead of its turn."""
+        # The SDK only records the window's starting bookmark once it syncs it
+        self._write_starting_replication_value(window)
+        yield from self._request_positioned_records(window)
+
 
     def post_process(
         self,
@@ -276,16 +1161,36 @@ class ZohoInventoryStream(RESTStream):
         Returns:
             The updated record dictionary, or ``None`` to skip the record.
         """
+        if not self.selected:
+            # Records of a deselected parent are never emitted, the children only
+            # need their ids.
+            return row
         self.replace_value(row,'',None)
         return row
 
-    def replace_value(self, obj,val,replacement):
-        for key in obj:
-            if type(obj[key]) == dict:
-                self.replace_value(obj[key],val,replacement)
+    def replace_value(self, obj, val, replacement):
+        """Replace ``val`` with ``replacement`` in every dict nested in ``obj``.
+
+        Walks nested dicts and lists (line items, packages, documents...) with an
+        explicit stack rather than recursion.
+        """
+        val_type = type(val)
+        stack = [obj]
+        push, pop = stack.append, stack.pop
+        while stack:
+            node = pop()
+            if type(node) is dict:
+                for key, value in node.items():
+                    value_type = type(value)
+                    if value_type is dict or value_type is list:
+                        push(value)
+                    elif value_type is val_type and value == val:
+                        node[key] = replacement
             else:
-                if obj[key] == val:
-                    obj[key] = replacement
+                for value in node:
+                    value_type = type(value)
+                    if value_type is dict or value_type is list:
+                        push(value)
 
     def prepare_request_lines(self, url, params=None) -> requests.PreparedRequest:
         http_method = self.rest_method
@@ -306,14 +1211,235 @@ class ZohoInventoryStream(RESTStream):
         )
         return request
 
+    # Streams may sync in parallel (see `TapZohoInventory.sync_streams`), so every
+    # Singer message and state update goes through the tap's output lock.
+
+    def _write_record_message(self, record: dict) -> None:
+        index = self.change_index
+        record_id = None
+        if index is not None:
+            record_id = self._record_id(record)
+            digest = index.digest(record)
+            if record_id is not None and index.emitted(self.name, record_id, digest):
+                index.skipped_records[self.name] += 1
+                return
+        # Records are conformed and encoded before taking the lock, parallel
+        # streams only wait for each other to write.
+        writer = self.message_writer
+        time_extracted = utc_now()
+        lines = [
+            writer.encode_record(stream_alias, mapped_record, time_extracted)
+            for stream_alias, mapped_record in self._map_record(record)
+        ]
+        with self._tap.output_lock:
+            writer.write(lines)
+            self._is_state_flushed = False
+        self.sync_metrics.observe_record(self.name)
+        if record_id is not None:
+            index.put(self.name, record_id, record.get(self.modified_field), digest)
+
+    @cached_property
+    def _conform_record(self) -> Callable[[dict], tuple[dict, list[str]]]:
+        """Return the record conformance compiled for the stream's schema and selection."""
+        return compile_conformer(self.schema, self.mask, self.TYPE_CONFORMANCE_LEVEL)
+
+    def _map_record(self, record: dict) -> Iterable[tuple[str, dict]]:
+        """Yield the stream alias and record of every stream map keeping the
+        record, once conformed, see `compile_conformer`."""
+        if self.TYPE_CONFORMANCE_LEVEL is TypeConformanceLevel.NONE:
+            for record_message in super()._generate_record_messages(record):
+                yield record_message.stream, record_message.record
+            return
+        record, unmapped_properties = self._conform_record(record)
+        if unmapped_properties:
+            _warn_unmapped_properties(self.name, tuple(unmapped_properties), self.logger)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            # Emit record if not filtered
+            if mapped_record is not None:
+                yield stream_map.stream_alias, mapped_record
+
+    def _generate_record_messages(self, record: dict) -> Iterable[singer.RecordMessage]:
+        """Yield the RECORD messages of a record, see `_map_record`."""
+        for stream_alias, mapped_record in self._map_record(record):
+            yield singer.RecordMessage(
+                stream=stream_alias,
+                record=mapped_record,
+                version=None,
+                time_extracted=utc_now(),
+            )
+
+    @property
+    def message_writer(self) -> MessageWriter:
+        """Return the writer of RECORD lines shared by all streams of the tap."""
+        return self._tap.message_writer
+
+    def _write_schema_message(self) -> None:
+        with self._tap.output_lock:
+            self.message_writer.flush()
+            super()._write_schema_message()
+
+    def _write_state_message(self) -> None:
+        with self._tap.output_lock:
+            # The SDK's `sync_all` and dry runs end on this call, the records
+            # buffered since the latest STATE go out even if it is up to date
+            self.message_writer.flush()
+            if self._is_state_flushed:
+                return
+            # Every state update holds the lock too, this is a consistent snapshot
+            line = format_message(StateMessage(value=self.tap_state))
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+            self._is_state_flushed = True
+            if self.change_index is not None:
+                # The records emitted so far are followed by a STATE message
+                self.change_index.commit()
+            if self.quota is not None:
+                self.quota.save()
+
+    # Whether the stream may wait for a later run when the daily budget is short
+    deferrable = False
+
+    @property
+    def quota(self) -> DailyQuota | None:
+        """Return the API calls counted today, shared by all streams of the tap."""
+        return self._tap.quota
+
+    def _stream_tree(self) -> list[str]:
+        """Return the names of this stream and of its descendants."""
+        names = [self.name]
+        for child in self.child_streams:
+            names.extend(child._stream_tree())
+        return names
+
+    def _write_replication_key_signpost(self, context: dict | None, value) -> None:
+        with self._tap.output_lock:
+            super()._write_replication_key_signpost(context, value)
+
+    @property
+    def stream_state(self) -> dict:
+        # Creates the bookmark of the stream on first access
+        with self._tap.output_lock:
+            return super().stream_state
+
+    def get_context_state(self, context: dict | None) -> dict:
+        with self._tap.output_lock:
+            return super().get_context_state(context)
+
+    def _increment_stream_state(self, latest_record, *, context=None) -> None:
+        with self._tap.output_lock:
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _write_starting_replication_value(self, context: dict | None) -> None:
+        with self._tap.output_lock:
+            super()._write_starting_replication_value(context)
+
+    def finalize_state_progress_markers(self, state: dict | None = None) -> None:
+        with self._tap.output_lock:
+            super().finalize_state_progress_markers(state)
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the HTTP session shared by all streams of the tap."""
+        return self._tap.requests_session
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """Return the connect and read timeouts of the requests, in seconds."""
+        return (
+            self.config.get("connect_timeout", 30),
+            self.config.get("request_timeout", 300),
+        )
+
+    @property
+    def rate_limiter(self):
+        """Return the rate limiter shared by all streams of the tap."""
+        return self._tap.rate_limiter
+
+    @cached_property
+    def _base_path(self) -> str:
+        return urlparse(self.url_base).path
+
+    def _endpoint_path(self, response) -> str:
+        """Return the path of a response's request, relative to `url_base`."""
+        return urlparse(response.request.url).path.replace(self._base_path, "", 1)
+
+    @property
+    def sync_metrics(self):
+        """Return the request and record metrics shared by all streams of the tap."""
+        return self._tap.sync_metrics
+
+    def _request(self, prepared_request, context, stream=False):
+        self.sync_metrics.observe_rate_limit_wait(self.name, self.rate_limiter.acquire())
+        # validate_response runs inside the SDK's _request, right after the send
+        self._local.request_started = time.perf_counter()
+        if not stream:
+            return super()._request(prepared_request, context)
+        # Same as the SDK's _request, leaving successful bodies to be decoded
+        # while they download, see `StreamedPage`.
+        response = self.requests_session.send(
+            prepared_request, timeout=self.timeout, stream=True
+        )
+        if response.ok:
+            response._zoho_page = StreamedPage(
+                response.iter_content(chunk_size=self.stream_chunk_size)
+            )
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        self.validate_response(response)
+        return response
+
+    # Bytes read at a time from streamed list pages
+    stream_chunk_size = 64 * 1024
+
+    def backoff_handler(self, details) -> None:
+        if not self._tap.retry_budget.take():
+            # Another thread took the last retry since `_retry_budget_exhausted`
+            self._log_retry_budget_exhausted()
+            raise details["exception"]
+        self.sync_metrics.observe_retry(self.name, details.get("wait"))
+        super().backoff_handler(details)
+
+    def _log_failed_response(self, response: requests.Response) -> None:
+        # Error bodies may echo request data, they are only logged at DEBUG
+        self.logger.warning(
+            "Stream '%s': status code %s for %s",
+            self.name,
+            response.status_code,
+            response.request.url,
+        )
+        self.logger.debug("Stream '%s': response body: %s", self.name, response.text)
+
     def validate_response(self, response):
-        self.logger.info(f"Stream '{self.name}': Request URL: {response.request.url}")
-        sleep(1.01)
-        
+        self.logger.debug("Stream '%s': Request URL: %s", self.name, response.request.url)
+        size = response.headers.get("Content-Length")
+        if size is None and not hasattr(response, "_zoho_page"):
+            # Streamed pages are measured once read, see `_iter_pages`
+            size = len(response.content)
+        if self.quota is not None:
+            self.quota.record(self.name, self.logger)
+        requests_sent = self.sync_metrics.observe_request(
+            self.name,
+            self._endpoint_path(response),
+            response.status_code,
+            time.perf_counter() - self._local.request_started,
+            int(size or 0),
+        )
+        summary_every = self.config.get("log_summary_every", 1000)
+        if summary_every and requests_sent % summary_every == 0:
+            self.sync_metrics.log_stream_summary(self.logger, self.name)
+        self.rate_limiter.update_from_headers(response.headers)
+
         if response.status_code == 429:
-            msg = f"Rate limit exceeded: {response.text}"
-            self.logger.warning(msg)
+            self._log_failed_response(response)
             self._handle_rate_limit(response)
+            msg = f"Rate limit exceeded: {self.response_error_message(response)}"
             raise RetriableAPIError(msg, response)
         
         if (
@@ -321,9 +1447,9 @@ class ZohoInventoryStream(RESTStream):
             or 500 <= response.status_code < 600
         ):
             msg = self.response_error_message(response)
-            self.logger.warn(f"Status code: {response.status_code}, message: {response.text}")
+            self._log_failed_response(response)
             raise RetriableAPIError(msg, response)
         elif 400 <= response.status_code < 500:
-            self.logger.warn(f"Status code: {response.status_code}, message: {response.text}")
+            self._log_failed_response(response)
             msg = self.response_error_message(response)
             raise FatalAPIError(msg)
@@ -0,0 +1,160 @@
+"""Record conformance compiled once per stream from its schema and selection."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import (
+    TypeConformanceLevel,
+    _conform_primitive_property,
+    is_boolean_type,
+    is_object_type,
+    is_uniform_list,
+)
+
+# Types decoded from JSON, which the SDK only converts for boolean properties
+_JSON_TYPES = frozenset((str, int, float, bool, type(None), list, dict))
+
+# Handler of the properties deselected in the catalog
+_DESELECTED = object()
+
+# Conforms a value, given its path in the record for the unmapped properties
+Handler = Callable[[Any, str, list], Any]
+
+
+def compile_conformer(
+    schema: dict,
+    mask: dict | None = None,
+    level: TypeConformanceLevel = TypeConformanceLevel.RECURSIVE,
+) -> Callable[[dict], tuple[dict, list[str]]]:
+    """Return a function conforming records of ``schema`` like the SDK does.
+
+    The SDK resolves the type and the catalog selection of every property of
+    every record it writes (``pop_deselected_record_properties`` then
+    ``conform_record_data_types``). Here they are resolved once into a handler
+    per property, and properties whose values are written as they are cost a
+    single lookup.
+
+    Args:
+        schema: The stream schema.
+        mask: The catalog selection of the stream properties.
+        level: How deep values are conformed, ``ROOT_ONLY`` or ``RECURSIVE``.
+
+    Returns:
+        A function returning the conformed copy of a record and the paths of the
+        record properties missing from the schema.
+    """
+    conform_object = _compile_object(
+        schema, mask, (), level is TypeConformanceLevel.RECURSIVE
+    )
+
+    def conform(record: dict) -> tuple[dict, list[str]]:
+        unmapped: list[str] = []
+        return conform_object(record, "", unmapped), unmapped
+
+    return conform
+
+
+def _compile_object(
+    schema: dict, mask: dict | None, breadcrumb: tuple, recursive: bool
+) -> Handler:
+    handlers: dict[str, Any] = {}
+    for name, property_schema in schema.get("properties", {}).items():
+        property_breadcrumb = (*breadcrumb, "properties", name)
+        if mask is not None and not mask[property_breadcrumb]:
+            handlers[name] = _DESELECTED
+        else:
+            handlers[name] = _compile_property(
+                property_schema, mask, property_breadcrumb, recursive
+            )
+
+    def conform(obj: dict, path: str, unmapped: list) -> dict:
+        output = {}
+        for name, value in obj.items():
+            try:
+                handler = handlers[name]
+            except KeyError:
+                unmapped.append(f"{path}.{name}" if path else name)
+                continue
+            if handler is None:
+                output[name] = (
+                    value if type(value) in _JSON_TYPES
+                    else _conform_primitive_property(value, {})
+                )
+            elif handler is not _DESELECTED:
+                output[name] = handler(
+                    value, f"{path}.{name}" if path else name, unmapped
+                )
+        return output
+
+    return conform
+
+
+def _compile_property(
+    property_schema: dict, mask: dict | None, breadcrumb: tuple, recursive: bool
+) -> Handler | None:
+    """Return the handler of a property, or ``None`` if values are kept as is."""
+    boolean = bool(is_boolean_type(property_schema))
+    uniform = is_uniform_list(property_schema)
+    items = None
+    if uniform and recursive:
+        items = _compile_value(property_schema["items"], recursive)
+    structured = bool(is_object_type(property_schema)) and "properties" in property_schema
+    fields = None
+    if structured and recursive:
+        fields = _compile_object(property_schema, mask, breadcrumb, recursive)
+    prune = None
+    if fields is None and _has_nested_selection(mask, breadcrumb):
+        # Like the SDK, drop the deselected properties of nested objects even
+        # when they are not conformed.
+        def prune(value: dict) -> None:
+            pop_deselected_record_properties(value, {}, mask, None, breadcrumb)
+
+    if not boolean and items is None and fields is None and prune is None:
+        return None
+
+    def conform(value: Any, path: str, unmapped: list) -> Any:
+        value_type = type(value)
+        if value_type is list and uniform:
+            return value if items is None else [items(item, path, unmapped) for item in value]
+        if value_type is dict:
+            if prune is not None:
+                prune(value)
+            if structured:
+                return value if fields is None else fields(value, path, unmapped)
+        if boolean or value_type not in _JSON_TYPES:
+            return _conform_primitive_property(value, property_schema)
+        return value
+
+    return conform
+
+
+def _compile_value(schema: dict, recursive: bool) -> Handler:
+    """Return the handler of the items of a uniform list.
+
+    The catalog selection doesn't apply to list items, only their schema does.
+    """
+    boolean = bool(is_boolean_type(schema))
+    fields = None
+    if is_object_type(schema):
+        fields = _compile_object(schema, None, (), recursive)
+
+    def conform(value: Any, path: str, unmapped: list) -> Any:
+        if fields is not None and type(value) is dict:
+            return fields(value, path, unmapped)
+        if boolean or type(value) not in _JSON_TYPES:
+            return _conform_primitive_property(value, schema)
+        return value
+
+    return conform
+
+
+def _has_nested_selection(mask: dict | None, breadcrumb: tuple) -> bool:
+    """Return whether the catalog selects properties nested under ``breadcrumb``."""
+    if not mask:
+        return False
+    depth = len(breadcrumb)
+    return any(
+        len(key) > depth and key[:depth] == breadcrumb for key in mask
+    )
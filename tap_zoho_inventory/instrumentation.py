@@ -0,0 +1,277 @@
+"""Request and throughput metrics collected across every zoho-inventory stream."""
+
+from __future__ import annotations
+
+import enum
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from singer_sdk import metrics
+
+# Detail ids in request paths, e.g. `/salesorders/4000000001234`
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def _escape_label(value) -> str:
+    """Escape a Prometheus label value as the text exposition format requires."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ZohoMetric(str, enum.Enum):
+    """Run totals reported next to the SDK's per-interval metrics."""
+
+    HTTP_REQUEST_COUNT = "zoho_http_requests"
+    HTTP_REQUEST_DURATION = "zoho_http_request_seconds"
+    HTTP_RESPONSE_BYTES = "zoho_http_response_bytes"
+    HTTP_RETRY_COUNT = "zoho_http_retries"
+    RATE_LIMIT_WAIT = "zoho_rate_limit_wait_seconds"
+    BACKOFF_WAIT = "zoho_backoff_wait_seconds"
+    RECORD_COUNT = "zoho_records"
+
+
+class _EndpointStats:
+    """Totals of the requests sent by a stream to an endpoint."""
+
+    __slots__ = ("requests", "seconds", "max_seconds", "bytes", "statuses")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.statuses: dict[int, int] = defaultdict(int)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "seconds": round(self.seconds, 3),
+            "mean_seconds": round(self.seconds / self.requests, 4) if self.requests else 0,
+            "max_seconds": round(self.max_seconds, 4),
+            "bytes": self.bytes,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+        }
+
+
+class _StreamStats:
+    """Totals of a stream that don't depend on the endpoint."""
+
+    __slots__ = ("requests", "records", "retries", "rate_limit_wait", "backoff_wait")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.records = 0
+        self.retries = 0
+        self.rate_limit_wait = 0.0
+        self.backoff_wait = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "records": self.records,
+            "retries": self.retries,
+            "rate_limit_wait_seconds": round(self.rate_limit_wait, 3),
+            "backoff_wait_seconds": round(self.backoff_wait, 3),
+        }
+
+
+class SyncMetrics:
+    """Thread-safe collector of the requests and records of a sync.
+
+    The totals are logged as Singer METRIC lines every ``log_interval`` seconds
+    and at the end of the run, and can be written to a JSON or Prometheus text
+    file, see `write_summary`.
+    """
+
+    def __init__(self, logger=None, log_interval: float = 60) -> None:
+        self.logger = logger or metrics.get_metrics_logger()
+        self.log_interval = log_interval
+        self._endpoints: dict[tuple[str, str], _EndpointStats] = defaultdict(_EndpointStats)
+        self._streams: dict[str, _StreamStats] = defaultdict(_StreamStats)
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._cpu_started = time.process_time()
+        self._last_log = time.monotonic()
+
+    @staticmethod
+    def endpoint(path: str) -> str:
+        """Return the endpoint of a request path, with ids replaced by ``{id}``."""
+        return _ID_SEGMENT.sub("/{id}", path)
+
+    def observe_request(
+        self, stream: str, path: str, status: int, seconds: float, size: int
+    ) -> int:
+        """Record a response received by ``stream``.
+
+        Returns:
+            The number of responses received by the stream so far.
+        """
+        with self._lock:
+            stats = self._endpoints[(stream, self.endpoint(path))]
+            stats.requests += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.bytes += size
+            stats.statuses[status] += 1
+            stream_stats = self._streams[stream]
+            stream_stats.requests += 1
+            requests_sent = stream_stats.requests
+        self.maybe_log()
+        return requests_sent
+
+    def observe_bytes(self, stream: str, path: str, size: int) -> None:
+        """Record the size of a response body read after `observe_request`."""
+        with self._lock:
+            self._endpoints[(stream, self.endpoint(path))].bytes += size
+
+    def observe_retry(self, stream: str, wait: float) -> None:
+        """Record a retry scheduled after ``wait`` seconds of backoff."""
+        with self._lock:
+            stats = self._streams[stream]
+            stats.retries += 1
+            stats.backoff_wait += wait or 0.0
+
+    def observe_rate_limit_wait(self, stream: str, seconds: float) -> None:
+        """Record time spent waiting for the rate limiter."""
+        if seconds:
+            with self._lock:
+                self._streams[stream].rate_limit_wait += seconds
+
+    def observe_record(self, stream: str) -> None:
+        """Record a RECORD message written for ``stream``."""
+        with self._lock:
+            self._streams[stream].records += 1
+
+    def log_stream_summary(self, logger, stream: str) -> None:
+        """Log one line summarizing the requests and records of ``stream``."""
+        with self._lock:
+            stats = self._streams[stream]
+            endpoints = [
+                endpoint_stats
+                for (endpoint_stream, _), endpoint_stats in self._endpoints.items()
+                if endpoint_stream == stream
+            ]
+            seconds = sum(endpoint_stats.seconds for endpoint_stats in endpoints)
+            errors = sum(
+                count
+                for endpoint_stats in endpoints
+                for status, count in endpoint_stats.statuses.items()
+                if status >= 400
+            )
+            logger.info(
+                "Stream '%s': %d requests (%d errors, %d retries), %.1fs in "
+                "requests, %.1fs waiting on the rate limit, %d records",
+                stream,
+                stats.requests,
+                errors,
+                stats.retries,
+                seconds,
+                stats.rate_limit_wait,
+                stats.records,
+            )
+
+    def log_stream_summaries(self, logger) -> None:
+        """Log the summary line of every stream that sent requests."""
+        with self._lock:
+            streams = sorted(self._streams)
+        for stream in streams:
+            self.log_stream_summary(logger, stream)
+
+    def maybe_log(self) -> None:
+        """Log the metrics if ``log_interval`` seconds passed since last time."""
+        now = time.monotonic()
+        if now - self._last_log < self.log_interval:
+            return
+        with self._lock:
+            if now - self._last_log < self.log_interval:
+                return
+            self._last_log = now
+        self.log()
+
+    def log(self) -> None:
+        """Log the totals so far as Singer METRIC lines."""
+        for point in self._points():
+            metrics.log(self.logger, point)
+
+    def _points(self) -> list[metrics.Point]:
+        points = []
+        with self._lock:
+            for (stream, endpoint), stats in self._endpoints.items():
+                tags = {metrics.Tag.STREAM: stream, metrics.Tag.ENDPOINT: endpoint}
+                points += [
+                    metrics.Point("counter", ZohoMetric.HTTP_REQUEST_COUNT, stats.requests, tags),
+                    metrics.Point("timer", ZohoMetric.HTTP_REQUEST_DURATION, round(stats.seconds, 3), tags),
+                    metrics.Point("counter", ZohoMetric.HTTP_RESPONSE_BYTES, stats.bytes, tags),
+                ]
+            for stream, stats in self._streams.items():
+                tags = {metrics.Tag.STREAM: stream}
+                points += [
+                    metrics.Point("counter", ZohoMetric.RECORD_COUNT, stats.records, tags),
+                    metrics.Point("counter", ZohoMetric.HTTP_RETRY_COUNT, stats.retries, tags),
+                    metrics.Point("timer", ZohoMetric.RATE_LIMIT_WAIT, round(stats.rate_limit_wait, 3), tags),
+                    metrics.Point("timer", ZohoMetric.BACKOFF_WAIT, round(stats.backoff_wait, 3), tags),
+                ]
+        return points
+
+    def summary(self) -> dict:
+        """Return the totals of the run per stream and endpoint."""
+        with self._lock:
+            streams: dict = {
+                stream: {**stats.to_dict(), "endpoints": {}}
+                for stream, stats in self._streams.items()
+            }
+            for (stream, endpoint), stats in self._endpoints.items():
+                streams.setdefault(
+                    stream, {**_StreamStats().to_dict(), "endpoints": {}}
+                )["endpoints"][endpoint] = stats.to_dict()
+        return {
+            "started_at": self._started,
+            "wall_seconds": round(time.time() - self._started, 3),
+            "cpu_seconds": round(time.process_time() - self._cpu_started, 3),
+            "streams": streams,
+        }
+
+    def write_summary(self, path: str, summary_format: str = "json") -> None:
+        """Write the run totals to ``path`` as JSON or Prometheus text."""
+        summary = self.summary()
+        if summary_format == "prometheus":
+            content = self._prometheus(summary)
+        else:
+            content = json.dumps(summary, indent=2)
+        Path(path).write_text(content)
+
+    @staticmethod
+    def _prometheus(summary: dict) -> str:
+        prefix = "tap_zoho_inventory"
+        samples: dict[str, list[str]] = defaultdict(list)
+        types = {}
+
+        def add(name, metric_type, value, **labels):
+            types[name] = metric_type
+            label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+            samples[name].append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        for stream, stats in summary["streams"].items():
+            add("records_total", "counter", stats["records"], stream=stream)
+            add("retries_total", "counter", stats["retries"], stream=stream)
+            add("rate_limit_wait_seconds_total", "counter", stats["rate_limit_wait_seconds"], stream=stream)
+            add("backoff_wait_seconds_total", "counter", stats["backoff_wait_seconds"], stream=stream)
+            for endpoint, endpoint_stats in stats["endpoints"].items():
+                for status, count in endpoint_stats["statuses"].items():
+                    add("requests_total", "counter", count, stream=stream, endpoint=endpoint, status=status)
+                add("request_seconds_total", "counter", endpoint_stats["seconds"], stream=stream, endpoint=endpoint)
+                add("request_seconds_max", "gauge", endpoint_stats["max_seconds"], stream=stream, endpoint=endpoint)
+                add("response_bytes_total", "counter", endpoint_stats["bytes"], stream=stream, endpoint=endpoint)
+        lines = [
+            f"# TYPE {prefix}_wall_seconds gauge",
+            f"{prefix}_wall_seconds {summary['wall_seconds']}",
+            f"# TYPE {prefix}_cpu_seconds gauge",
+            f"{prefix}_cpu_seconds {summary['cpu_seconds']}",
+        ]
+        for name, name_samples in samples.items():
+            lines.append(f"# TYPE {prefix}_{name} {types[name]}")
+            lines += name_samples
+        return "\n".join(lines) + "\n"
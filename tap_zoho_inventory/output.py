@@ -0,0 +1,124 @@
+"""Buffered writing of the Singer messages of every zoho-inventory stream."""
+
+from __future__ import annotations
+
+import re
+import sys
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+import simplejson
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_non_ascii(match: re.Match) -> str:
+    code = ord(match.group())
+    if code > 0xFFFF:
+        # JSON escapes characters beyond the BMP as surrogate pairs
+        code -= 0x10000
+        return "\\u%04x\\u%04x" % (0xD800 | code >> 10, 0xDC00 | code & 0x3FF)
+    return "\\u%04x" % code
+
+
+def _orjson_default(value: Any) -> str:
+    if isinstance(value, Decimal):
+        # orjson can't write decimals as numbers, see `encode_record`
+        raise TypeError
+    return str(value)
+
+
+class MessageWriter:
+    """Writer of RECORD lines to stdout, in chunks of ``buffer_size`` bytes.
+
+    RECORD lines are encoded with orjson when it is installed, around an
+    envelope built once per stream. They read like the SDK's, only with
+    compact separators and non-ASCII characters written as UTF-8, unless
+    stdout can't take them: they are then escaped, as the SDK does.
+
+    Encoding doesn't need the tap's output lock, writing does. Other messages
+    are written by the SDK straight to stdout, `flush` must be called first so
+    they come after the records buffered before them.
+    """
+
+    def __init__(self, buffer_size: int = 1024 * 1024) -> None:
+        self.buffer_size = buffer_size
+        self._envelopes: dict[str, bytes] = {}
+        self._chunks: list[bytes] = []
+        self._buffered = 0
+
+    def _envelope(self, stream: str) -> bytes:
+        envelope = self._envelopes.get(stream)
+        if envelope is None:
+            envelope = self._envelopes[stream] = (
+                '{"type":"RECORD","stream":%s,"record":' % simplejson.dumps(stream)
+            ).encode()
+        return envelope
+
+    def encode_record(
+        self, stream: str, record: dict, time_extracted: datetime | None
+    ) -> bytes:
+        """Return the RECORD line of a record, as the SDK formats it."""
+        data = None
+        if orjson is not None:
+            try:
+                data = orjson.dumps(
+                    record,
+                    default=_orjson_default,
+                    option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+                )
+            except orjson.JSONEncodeError:
+                # Decimals or integers beyond 64 bits
+                pass
+        if data is None:
+            data = simplejson.dumps(
+                record, use_decimal=True, default=str, separators=(",", ":")
+            ).encode()
+        if time_extracted is None:
+            return b"".join((self._envelope(stream), data, b"}\n"))
+        return b"".join(
+            (
+                self._envelope(stream),
+                data,
+                b',"time_extracted":"',
+                str(time_extracted).encode(),
+                b'"}\n',
+            )
+        )
+
+    def write(self, lines: list[bytes]) -> None:
+        """Buffer encoded lines, writing them once the buffer is full."""
+        self._chunks.extend(lines)
+        self._buffered += sum(len(line) for line in lines)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines to stdout."""
+        if not self._chunks:
+            return
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self._buffered = 0
+        stdout = sys.stdout
+        binary = getattr(stdout, "buffer", None)
+        encoding = (getattr(stdout, "encoding", None) or "").lower().replace("_", "-")
+        if binary is not None and encoding in ("utf-8", "utf8"):
+            # Text written by the SDK is still in the text layer
+            stdout.flush()
+            binary.write(data)
+            binary.flush()
+            return
+        text = data.decode()
+        if encoding and encoding not in ("utf-8", "utf8"):
+            # e.g. PYTHONIOENCODING=ascii, which the SDK's ASCII-only lines suit
+            text = _NON_ASCII.sub(_escape_non_ascii, text)
+        stdout.write(text)
+        stdout.flush()
@@ -0,0 +1,134 @@
+"""Accounting of the daily Zoho API call quota across runs."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class DailyQuota:
+    """Thread-safe count of the API calls made today, per stream.
+
+    Zoho caps the calls an organization makes per day. The calls of every run
+    of the same (UTC) day add up in the JSON file at ``path``, along with the
+    calls each stream made in its latest run, which are used to project how
+    many calls syncing the stream again is going to take.
+
+    Deferrable streams are held back when the projection doesn't fit in what
+    is left of ``budget``, see `defer`, so the budget goes to the streams that
+    matter rather than running out halfway through them.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        budget: int | None = None,
+        today: str | None = None,
+    ) -> None:
+        self.path = path
+        self.budget = budget
+        self.date = today or _today()
+        self._lock = threading.Lock()
+        self._warned = False
+        self.used_today: Counter = Counter()
+        self.used_this_run: Counter = Counter()
+        self.latest_runs: dict[str, int] = {}
+        self.deferred: list[str] = []
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not Path(self.path).is_file():
+            return
+        try:
+            saved = json.loads(Path(self.path).read_text())
+        except ValueError:
+            logging.getLogger(__name__).warning(
+                "Ignoring unreadable quota file %s", self.path
+            )
+            return
+        self.latest_runs = dict(saved.get("latest_runs", {}))
+        if saved.get("date") == self.date:
+            self.used_today.update(saved.get("calls", {}))
+
+    # Callers hold the lock: other threads add streams to the counters
+
+    def _used(self) -> int:
+        return sum(self.used_today.values())
+
+    def _remaining(self) -> int | None:
+        if self.budget is None:
+            return None
+        return max(0, self.budget - self._used())
+
+    @property
+    def used(self) -> int:
+        """Return the number of calls made today."""
+        with self._lock:
+            return self._used()
+
+    @property
+    def remaining(self) -> int | None:
+        """Return the calls left in the budget today, ``None`` without a budget."""
+        with self._lock:
+            return self._remaining()
+
+    def record(self, stream: str, logger: logging.Logger | None = None) -> None:
+        """Count a call made by ``stream``."""
+        with self._lock:
+            self.used_today[stream] += 1
+            self.used_this_run[stream] += 1
+            exceeded = (
+                self.budget is not None and not self._warned and self._used() >= self.budget
+            )
+            if exceeded:
+                self._warned = True
+        if exceeded and logger is not None:
+            logger.warning(
+                "Reached the daily API budget of %d calls, Zoho may start refusing requests",
+                self.budget,
+            )
+
+    def projected(self, streams: Iterable[str]) -> int:
+        """Return the calls the streams made in their latest run."""
+        with self._lock:
+            return sum(self.latest_runs.get(stream, 0) for stream in streams)
+
+    def defer(self, streams: Iterable[str]) -> bool:
+        """Return whether syncing the streams would overrun the budget today."""
+        streams = list(streams)
+        with self._lock:
+            remaining = self._remaining()
+            projected = sum(self.latest_runs.get(stream, 0) for stream in streams)
+            if remaining is None or projected <= remaining:
+                return False
+            self.deferred.extend(streams)
+            return True
+
+    def save(self) -> None:
+        """Write the calls counted so far to the quota file."""
+        if not self.path:
+            return
+        with self._lock:
+            latest_runs = {**self.latest_runs, **self.used_this_run}
+            data = json.dumps(
+                {
+                    "date": self.date,
+                    "calls": dict(self.used_today),
+                    "latest_runs": latest_runs,
+                },
+                indent=2,
+                sort_keys=True,
+            )
+            partial = f"{self.path}.tmp"
+            Path(partial).write_text(data)
+            os.replace(partial, self.path)
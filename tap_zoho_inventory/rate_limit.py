@@ -0,0 +1,113 @@
+"""Request throttling shared by every zoho-inventory stream."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Mapping
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket holding back requests to the Zoho API.
+
+    Tokens refill continuously at ``requests_per_minute / 60`` per second, up to
+    ``burst`` tokens. Every request takes one token and waits when none are left.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int) -> None:
+        self.rate = max(requests_per_minute, 1) / 60.0
+        self.capacity = float(max(burst, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Block until a request may be sent.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for the given number of seconds."""
+        with self._lock:
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + seconds
+            )
+            self._tokens = 0.0
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Align the bucket with the quota reported by the API.
+
+        Zoho reports the calls left in the current window in
+        ``X-Rate-Limit-Remaining`` and the seconds until it resets in
+        ``X-Rate-Limit-Reset``.
+        """
+        try:
+            remaining = int(headers["X-Rate-Limit-Remaining"])
+        except (KeyError, ValueError):
+            return
+        if remaining <= 0:
+            try:
+                reset = float(headers["X-Rate-Limit-Reset"])
+            except (KeyError, ValueError):
+                reset = 60.0
+            self.pause(reset)
+            return
+        with self._lock:
+            self._tokens = min(self._tokens, float(remaining))
+
+
+class RetryBudget:
+    """Thread-safe count of the retries left for the whole run.
+
+    ``exhausted`` is set once a request needed a retry and none was left.
+    """
+
+    def __init__(self, max_retries: int) -> None:
+        self.max_retries = max_retries
+        self.exhausted = False
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.max_retries - self._used)
+
+    def has_retry(self) -> bool:
+        """Return whether a retry is left, without taking it."""
+        with self._lock:
+            if self._used >= self.max_retries:
+                self.exhausted = True
+                return False
+            return True
+
+    def take(self) -> bool:
+        """Take one retry from the budget, return False if none is left."""
+        with self._lock:
+            if self._used >= self.max_retries:
+                self.exhausted = True
+                return False
+            self._used += 1
+            return True
@@ -0,0 +1,139 @@
+"""Incremental decoding of the list pages returned by the Zoho API."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class StreamedPage:
+    """JSON object of a response body, decoded while the body is downloaded.
+
+    The items of the first array member of the object, the records of a Zoho
+    list page, are yielded one at a time as soon as they are complete, so only
+    the record being processed and the bytes not decoded yet are held in
+    memory. The other members, such as ``page_context`` which Zoho sends after
+    the records, are kept in `fields` along with the last record of the list,
+    which is all the pagination looks at.
+
+    The records can be iterated once.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decode = json.JSONDecoder().raw_decode
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+        self.list_key: str | None = None
+        self.fields: dict[str, Any] = {}
+        self._records = self._parse()
+
+    def __iter__(self) -> Iterator[dict]:
+        return self._records
+
+    def first(self) -> dict | None:
+        """Return the first record without consuming it, ``None`` on empty pages."""
+        record = next(self._records, None)
+        if record is not None:
+            self._records = _prepend(record, self._records)
+        return record
+
+    def finish(self) -> dict:
+        """Read the rest of the body and return the members other than the records."""
+        for _ in self._records:
+            pass
+        return self.fields
+
+    def _parse(self) -> Iterator[dict]:
+        if self._next_char() != "{":
+            raise ValueError("Expected a JSON object")
+        self._pos += 1
+        while True:
+            char = self._next_char()
+            if char == "}":
+                self._pos += 1
+                return
+            if char == ",":
+                self._pos += 1
+                continue
+            key = self._value()
+            if self._next_char() != ":":
+                raise ValueError(f"Expected ':' after key {key!r}")
+            self._pos += 1
+            if self.list_key is not None or self._next_char() != "[":
+                self.fields[key] = self._value()
+                continue
+            self.list_key = key
+            self._pos += 1
+            last = None
+            while True:
+                char = self._next_char()
+                if char == "]":
+                    self._pos += 1
+                    break
+                if char == ",":
+                    self._pos += 1
+                    continue
+                last = self._value()
+                yield last
+            self.fields[key] = [] if last is None else [last]
+
+    def _next_char(self) -> str:
+        """Return the next character that isn't whitespace, without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(1):
+                raise ValueError("Truncated JSON document")
+
+    def _value(self) -> Any:
+        """Decode the value starting at the next character that isn't whitespace."""
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete: at least double the pending text before trying
+                # again, so large values are decoded a bounded number of times.
+                if not self._fill(len(self._buffer) - self._pos):
+                    raise
+                continue
+            if end < len(self._buffer) or self._eof:
+                self._pos = end
+                return value
+            # A number at the end of the buffer may go on in the next chunk
+            self._fill(1)
+
+    def _fill(self, size: int) -> bool:
+        """Append up to ``size`` characters or more to the buffer.
+
+        Returns:
+            ``False`` if the whole body was already read.
+        """
+        if self._eof:
+            return False
+        # Drop the text already decoded
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        target = len(self._buffer) + max(size, 1)
+        for chunk in self._chunks:
+            self.bytes_read += len(chunk)
+            self._buffer += self._text.decode(chunk)
+            if len(self._buffer) >= target:
+                return True
+        self._buffer += self._text.decode(b"", final=True)
+        self._eof = True
+        return True
+
+
+def _prepend(item: Any, items: Iterator) -> Iterator:
+    yield item
+    yield from items
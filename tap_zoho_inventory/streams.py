@@ -22,6 +22,8 @@ class ProductsStream(ZohoInventoryStream):
     schema_filepath = SCHEMAS_DIR / "items_indv_schema.json"
     custom_fields_key = "item"
     has_lines = False
+    bulk_detail_path = "/itemdetails"
+    bulk_detail_param = "item_ids"
 
     def get_child_context(self, record, context):
         """Return a child context object for a given record."""
@@ -37,6 +39,7 @@ class PurchaseOrders(ZohoInventoryStream):
     replication_key = "last_modified_time"
     records_jsonpath = "$.purchaseorder[*]"
     custom_fields_key = "purchaseorder"
+    backfill_windows = True
 
     schema_filepath = SCHEMAS_DIR / "purchaseorders_indv_schema.json"
 
@@ -54,6 +57,7 @@ class SalesOrdersStream(ZohoInventoryStream):
     records_jsonpath = "$.salesorder"
     replication_key = "last_modified_time"
     custom_fields_key = "salesorder"
+    backfill_windows = True
 
     schema_filepath = SCHEMAS_DIR / "salesorders_indv_schema.json"
     # Optionally, you may also use `schema_filepath` in place of `schema`:
@@ -83,7 +87,7 @@ class SalesOrderDetailsStream(ZohoInventoryStream):
     custom_fields_key = "salesorder"
 
     def parse_response(self, response):
-        for record in extract_jsonpath(self.records_jsonpath, input=response.json()):
+        for record in extract_jsonpath(self.records_jsonpath, input=self.decode_response(response)):
             record = self.move_custom_fields_to_root(record)
             yield record
 
@@ -97,7 +101,7 @@ class PurchaseOrderDetailStream(ZohoInventoryStream):
     custom_fields_key = "purchaseorder"
 
     def parse_response(self, response):
-        for record in extract_jsonpath(self.records_jsonpath, input=response.json()):
+        for record in extract_jsonpath(self.records_jsonpath, input=self.decode_response(response)):
             record = self.move_custom_fields_to_root(record)
             yield record
 
@@ -111,7 +115,7 @@ class ProductDetailsStream(ZohoInventoryStream):
     custom_fields_key = "item"
 
     def parse_response(self, response):
-        for record in extract_jsonpath(self.records_jsonpath, input=response.json()):
+        for record in extract_jsonpath(self.records_jsonpath, input=self.decode_response(response)):
             record = self.move_custom_fields_to_root(record)
             yield record
 
@@ -125,9 +129,62 @@ class PurchaseReceivesStream(ZohoInventoryStream):
     has_lines = False
     custom_fields_key = "purchase_receive"
 
+    # Newest first, so offsets in a page aren't stable between runs
+    checkpoint_pages = False
+    # The pagination looks at every record of a page
+    streamable_pages = False
+    # Cleared as soon as a page shows the server ignored the sort order
+    sorted_by_server = True
+    _oldest_seen = None
+
+    def request_records(self, context):
+        # Every sync checks the sort order again
+        self.sorted_by_server = True
+        self._oldest_seen = None
+        yield from super().request_records(context)
+
+    def get_url_params(self, context, next_page_token):
+        params = super().get_url_params(context, next_page_token)
+        # The endpoint doesn't filter on last_modified_time, so ask for the newest
+        # changes first and stop paginating once the bookmark is reached.
+        params["sort_order"] = "D"
+        params.pop(self.replication_key, None)
+        return params
+
+    def get_next_page_token(self, response, previous_token):
+        next_page_token = super().get_next_page_token(response, previous_token)
+        starting_time = self.get_starting_time(None)
+        if next_page_token is None or starting_time is None:
+            return next_page_token
+
+        records = extract_jsonpath(self.records_jsonpath, input=self.decode_response(response))
+        for record in records:
+            modified_time = parse(record[self.replication_key])
+            if self._oldest_seen is not None and modified_time > self._oldest_seen:
+                if self.sorted_by_server:
+                    self.logger.warning(
+                        "Stream '%s' is not sorted by %s, scanning every page",
+                        self.name,
+                        self.replication_key,
+                    )
+                self.sorted_by_server = False
+            self._oldest_seen = modified_time
+
+        if (
+            self.sorted_by_server
+            and self._oldest_seen is not None
+            and self._oldest_seen <= starting_time
+        ):
+            self.logger.info(
+                "Stream '%s': reached the bookmark, skipping the remaining pages",
+                self.name,
+            )
+            return None
+        return next_page_token
+
     def post_process(self, row, context):
-        row_last_mod_time = parse(row["last_modified_time"])
-        if row_last_mod_time > self.get_starting_time(context):
+        starting_time = self.get_starting_time(context)
+        if starting_time is None or parse(row["last_modified_time"]) > starting_time:
             return super().post_process(row, context)
 
         return None
@@ -148,7 +205,7 @@ class PurchaseReceivesDetailStream(ZohoInventoryStream):
     custom_fields_key = "purchase_receive"
 
     def parse_response(self, response):
-        for record in extract_jsonpath(self.records_jsonpath, input=response.json()):
+        for record in extract_jsonpath(self.records_jsonpath, input=self.decode_response(response)):
             record = self.move_custom_fields_to_root(record)
             yield record
 
@@ -160,6 +217,7 @@ class CompositeItemsStream(ZohoInventoryStream):
     schema_filepath = SCHEMAS_DIR / "composite_items_schema.json"
     custom_fields_key = "composite_item"
     has_lines = False
+    deferrable = True
 
     def get_child_context(self, record, context):
         """Return a child context object for a given record."""
@@ -175,7 +233,7 @@ class CompositeItemsDetailsStream(ZohoInventoryStream):
      custom_fields_key = "composite_item"
 
      def parse_response(self, response):
-         for record in extract_jsonpath(self.records_jsonpath, input=response.json()):
+         for record in extract_jsonpath(self.records_jsonpath, input=self.decode_response(response)):
              record = self.move_custom_fields_to_root(record)
              yield record    
 
@@ -188,6 +246,7 @@ class AssemblyOrdersStream(ZohoInventoryStream):
     schema_filepath = SCHEMAS_DIR / "assembly_orders_schema.json"
     custom_fields_key = "bundle"
     has_lines = False
+    deferrable = True
     
     def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
         """Get records from the API."""
@@ -213,6 +272,6 @@ class AssemblyOrdersDetailsStream(ZohoInventoryStream):
     schema_filepath = SCHEMAS_DIR / "assembly_orders_details_schema.json"
     custom_fields_key = "bundle"
     def parse_response(self, response):
-        for record in extract_jsonpath(self.records_jsonpath, input=response.json()):
+        for record in extract_jsonpath(self.records_jsonpath, input=self.decode_response(response)):
             record = self.move_custom_fields_to_root(record)
             yield record    
@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
 from singer_sdk import Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
 
 # TODO: Import your custom stream types here:
 from tap_zoho_inventory import streams
+from tap_zoho_inventory.cache import ChangeIndex, DetailCache
+from tap_zoho_inventory.instrumentation import SyncMetrics
+from tap_zoho_inventory.output import MessageWriter
+from tap_zoho_inventory.quota import DailyQuota
+from tap_zoho_inventory.rate_limit import RetryBudget, TokenBucketRateLimiter
+from tap_zoho_inventory.transport import build_session
 import inspect
 
+if sys.version_info >= (3, 8):
+    from functools import cached_property
+else:
+    from cached_property import cached_property
+
 
 class TapZohoInventory(Tap):
     """ZohoInventory tap class."""
@@ -41,8 +61,281 @@ class TapZohoInventory(Tap):
             description="The url for the API service",
             required=True
         ),
+        th.Property(
+            "token_refresh_margin",
+            th.IntegerType,
+            default=300,
+            description="Number of seconds before expiry at which the access token is refreshed",
+        ),
+        th.Property(
+            "token_cache_path",
+            th.StringType,
+            description="File keeping the access token between runs, so short syncs can skip the refresh",
+        ),
+        th.Property(
+            "detail_concurrency",
+            th.IntegerType,
+            default=4,
+            description="Number of detail documents fetched in parallel for each list page",
+        ),
+        th.Property(
+            "page_size",
+            th.IntegerType,
+            description="Number of records requested per list page (Zoho allows up to 200)",
+        ),
+        th.Property(
+            "prefetch_pages",
+            th.IntegerType,
+            default=0,
+            description="Number of list pages of top-level streams requested ahead of the records being processed (0 disables prefetching)",
+        ),
+        th.Property(
+            "stream_list_pages",
+            th.BooleanType,
+            default=False,
+            description="Decode list pages while they download, holding a few records rather than whole pages in memory (can't be combined with prefetch_pages)",
+        ),
+        th.Property(
+            "parallel_streams",
+            th.IntegerType,
+            default=1,
+            description="Number of independent top-level streams synced at the same time",
+        ),
+        th.Property(
+            "backfill_window_days",
+            th.IntegerType,
+            description="Split the sales and purchase orders backfill from start_date into windows of this many days",
+        ),
+        th.Property(
+            "backfill_workers",
+            th.IntegerType,
+            default=1,
+            description="Number of backfill windows fetched at the same time",
+        ),
+        th.Property(
+            "checkpoint_interval",
+            th.IntegerType,
+            default=100,
+            description="Number of records between STATE messages recording the page and offset reached (0 disables checkpoints)",
+        ),
+        th.Property(
+            "requests_per_minute",
+            th.NumberType,
+            default=90,
+            description="Maximum number of API requests sent per minute across all streams",
+        ),
+        th.Property(
+            "rate_limit_burst",
+            th.IntegerType,
+            default=10,
+            description="Number of requests that may be sent back to back before throttling",
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            description="Number of kept-alive connections to the API (defaults to what the configured concurrency needs)",
+        ),
+        th.Property(
+            "request_timeout",
+            th.NumberType,
+            default=300,
+            description="Number of seconds to wait for a response",
+        ),
+        th.Property(
+            "connect_timeout",
+            th.NumberType,
+            default=30,
+            description="Number of seconds to wait for a connection to the API",
+        ),
+        th.Property(
+            "http2",
+            th.BooleanType,
+            default=False,
+            description="Send the requests over HTTP/2, requires the `http2` extra (httpx)",
+        ),
+        th.Property(
+            "retry_budget",
+            th.IntegerType,
+            default=500,
+            description="Number of failed requests retried during a run, across all streams, before giving up",
+        ),
+        th.Property(
+            "daily_call_budget",
+            th.IntegerType,
+            description="Number of API calls the tap may make per day (UTC); streams that can wait, such as assembly orders and composite items, are deferred to a later run when syncing them would exceed it",
+        ),
+        th.Property(
+            "quota_path",
+            th.StringType,
+            description="File counting the API calls made by the runs of the day, and by each stream in its latest run to project the calls of the next one",
+        ),
+        th.Property(
+            "preferences_cache_path",
+            th.StringType,
+            description="File caching the account custom-field preferences between runs",
+        ),
+        th.Property(
+            "preferences_cache_ttl",
+            th.IntegerType,
+            default=86400,
+            description="Number of seconds the cached preferences stay valid",
+        ),
+        th.Property(
+            "change_index_path",
+            th.StringType,
+            description="SQLite file remembering the records emitted by earlier runs, so unchanged details aren't fetched and identical records aren't emitted again (delete it to emit everything again)",
+        ),
+        th.Property(
+            "output_buffer_size",
+            th.IntegerType,
+            default=1048576,
+            description="Number of bytes of RECORD messages buffered before they are written to stdout, every STATE message writes them too (0 writes each record right away)",
+        ),
+        th.Property(
+            "metrics_log_interval",
+            th.NumberType,
+            default=60,
+            description="Number of seconds between METRIC log lines summarizing requests, waits and records per stream",
+        ),
+        th.Property(
+            "log_summary_every",
+            th.IntegerType,
+            default=1000,
+            description="Number of requests between the progress lines logged for each stream (0 disables them)",
+        ),
+        th.Property(
+            "metrics_summary_path",
+            th.StringType,
+            description="File receiving the request, wait and record totals of the run once it ends",
+        ),
+        th.Property(
+            "metrics_summary_format",
+            th.StringType,
+            default="json",
+            allowed_values=["json", "prometheus"],
+            description="Format of the metrics summary file",
+        ),
     ).to_dict()
 
+    _custom_fields = None
+    _custom_fields_lock = threading.Lock()
+
+    @cached_property
+    def rate_limiter(self) -> TokenBucketRateLimiter:
+        """Return the rate limiter shared by every stream of this tap."""
+        return TokenBucketRateLimiter(
+            requests_per_minute=self.config.get("requests_per_minute", 90),
+            burst=self.config.get("rate_limit_burst", 10),
+        )
+
+    @cached_property
+    def requests_session(self) -> requests.Session:
+        """Return the HTTP session shared by every stream of this tap."""
+        return build_session(self.config)
+
+    @cached_property
+    def output_lock(self) -> threading.RLock:
+        """Return the lock serializing Singer messages and state updates."""
+        return threading.RLock()
+
+    @cached_property
+    def stop_syncing(self) -> threading.Event:
+        """Return the event telling the streams to stop before their next page."""
+        return threading.Event()
+
+    @cached_property
+    def message_writer(self) -> MessageWriter:
+        """Return the writer of RECORD lines shared by every stream of this tap."""
+        return MessageWriter(self.config.get("output_buffer_size", 1024 * 1024))
+
+    @cached_property
+    def retry_budget(self) -> RetryBudget:
+        """Return the retries left for this run, shared by every stream."""
+        return RetryBudget(self.config.get("retry_budget", 500))
+
+    @cached_property
+    def quota(self) -> DailyQuota | None:
+        """Return the API calls counted today, if a budget or quota file is configured."""
+        path = self.config.get("quota_path")
+        budget = self.config.get("daily_call_budget")
+        if path is None and budget is None:
+            return None
+        return DailyQuota(path, budget)
+
+    @cached_property
+    def sync_metrics(self) -> SyncMetrics:
+        """Return the request and record metrics collected across streams."""
+        return SyncMetrics(log_interval=self.config.get("metrics_log_interval", 60))
+
+    @cached_property
+    def change_index(self) -> ChangeIndex | None:
+        """Return the index of the records emitted by earlier runs, if configured."""
+        path = self.config.get("change_index_path")
+        return ChangeIndex(path) if path else None
+
+    @cached_property
+    def detail_cache(self) -> DetailCache:
+        """Return the detail documents handed from parent to child streams."""
+        return DetailCache()
+
+    def get_custom_fields(self, stream: streams.ZohoInventoryStream) -> dict:
+        """Return the account custom fields, fetching them once per run.
+
+        Args:
+            stream: The stream used to request the preferences if needed.
+
+        Returns:
+            The custom fields keyed by entity type.
+        """
+        with self._custom_fields_lock:
+            if self._custom_fields is None:
+                custom_fields = self._read_preferences_cache()
+                if custom_fields is None:
+                    custom_fields = stream._fetch_custom_fields()
+                    if custom_fields is not None:
+                        self._write_preferences_cache(custom_fields)
+                self._custom_fields = custom_fields or {}
+            return self._custom_fields
+
+    def _read_preferences_cache(self) -> dict | None:
+        cache_path = self.config.get("preferences_cache_path")
+        if not cache_path or not Path(cache_path).is_file():
+            return None
+        try:
+            cached = json.loads(Path(cache_path).read_text())
+            age = time.time() - float(cached["fetched_at"])
+            custom_fields = cached["customfields"]
+            if not isinstance(custom_fields, dict):
+                raise TypeError(custom_fields)
+        except (ValueError, TypeError, KeyError):
+            # Missing or malformed entries are a miss too
+            self.logger.warning("Ignoring unreadable preferences cache %s", cache_path)
+            return None
+        if (
+            cached.get("organization_id") != self.config.get("organization_id")
+            or age > self.config.get("preferences_cache_ttl", 86400)
+        ):
+            return None
+        self.logger.info("Using custom fields cached %d seconds ago", age)
+        return custom_fields
+
+    def _write_preferences_cache(self, custom_fields: dict) -> None:
+        cache_path = self.config.get("preferences_cache_path")
+        if not cache_path:
+            return
+        # Runs sharing the file never read a partly written one
+        partial = f"{cache_path}.tmp"
+        Path(partial).write_text(
+            json.dumps(
+                {
+                    "organization_id": self.config.get("organization_id"),
+                    "fetched_at": time.time(),
+                    "customfields": custom_fields,
+                }
+            )
+        )
+        os.replace(partial, cache_path)
+
     def discover_streams(self) -> list[streams.ZohoInventoryStream]:
         """Return a list of discovered streams.
 
@@ -53,6 +346,178 @@ class TapZohoInventory(Tap):
            cls(self) for name, cls in inspect.getmembers(streams, inspect.isclass) if cls.__module__ == 'tap_zoho_inventory.streams'
         ]
 
+    @property
+    def streams(self) -> dict[str, streams.ZohoInventoryStream]:
+        """Return the streams by name, in the order they are synced.
+
+        The streams that can wait go last, so they are the ones deferred when
+        the daily API budget runs short.
+        """
+        if self._streams is None:
+            self._streams = dict(
+                sorted(super().streams.items(), key=lambda item: item[1].deferrable)
+            )
+        return self._streams
+
+
+    @classmethod
+    def invoke(  # type: ignore[override]
+        cls,
+        *,
+        about: bool = False,
+        about_format: str | None = None,
+        config: tuple[str, ...] = (),
+        state: str | None = None,
+        catalog: str | None = None,
+    ) -> None:
+        """Invoke the tap's command line interface, syncing with `sync_streams`.
+
+        Same as the SDK's, which runs its `sync_all` instead.
+        """
+        super(Tap, cls).invoke(about=about, about_format=about_format)
+        cls.print_version(print_fn=cls.logger.info)
+        config_files, parse_env_config = cls.config_from_cli_args(*config)
+
+        tap = cls(
+            config=config_files,  # type: ignore[arg-type]
+            state=state,
+            catalog=catalog,
+            parse_env_config=parse_env_config,
+            validate_config=True,
+        )
+        tap.sync_streams()
+
+    def sync_streams(self) -> None:
+        """Sync all streams, then report the metrics of the run.
+
+        Replaces the SDK's `sync_all`, which subclasses can't override, and is
+        what the command line runs. The SDK's `sync_all` and its dry runs
+        (``--test`` and the SDK test suite) still emit every record and STATE
+        message, commit the change index and save the daily quota, all of
+        which happen with each STATE message. They sync one stream after the
+        other though: ``parallel_streams`` and the deferral of streams that can
+        wait only apply here, and so do the end-of-run metrics and summary.
+        """
+        try:
+            self._sync_all_streams()
+        finally:
+            with self.output_lock:
+                self.message_writer.flush()
+            self._close_change_index()
+            self._save_quota()
+            self.sync_metrics.log_stream_summaries(self.logger)
+            self.sync_metrics.log()
+            summary_path = self.config.get("metrics_summary_path")
+            if summary_path:
+                self.sync_metrics.write_summary(
+                    summary_path, self.config.get("metrics_summary_format", "json")
+                )
+
+    def _close_change_index(self) -> None:
+        """Log what the change index saved, then close it."""
+        index = self.change_index
+        if index is None:
+            return
+        for stream in sorted(set(index.skipped_records) | set(index.skipped_details)):
+            self.logger.info(
+                "Stream '%s': skipped %d unchanged records and %d detail requests",
+                stream,
+                index.skipped_records[stream],
+                index.skipped_details[stream],
+            )
+        index.close()
+
+    def _save_quota(self) -> None:
+        """Log and save the API calls counted today."""
+        quota = self.quota
+        if quota is None:
+            return
+        self.logger.info(
+            "Made %d API calls this run, %d today%s",
+            sum(quota.used_this_run.values()),
+            quota.used,
+            "" if quota.budget is None else f" out of a budget of {quota.budget}",
+        )
+        if quota.deferred:
+            self.logger.warning(
+                "Deferred streams to stay within the daily API budget: %s",
+                ", ".join(quota.deferred),
+            )
+        quota.save()
+
+    def _sync_all_streams(self) -> None:
+        """Sync all streams, running top-level streams in parallel if configured."""
+        workers = self.config.get("parallel_streams", 1)
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        root_streams = []
+        for stream in self.streams.values():
+            if workers > 1:
+                # Create every bookmark up front, so the streams never add keys
+                # to the shared state while another thread serializes it.
+                _ = stream.stream_state
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+            elif not stream.parent_stream_type:
+                root_streams.append(stream)
+
+        if workers <= 1:
+            for stream in root_streams:
+                self._sync_stream_tree(stream)
+        else:
+            self._sync_in_parallel(root_streams, workers)
+
+        # Child streams log their costs too
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    def _sync_in_parallel(self, root_streams: list, workers: int) -> None:
+        """Sync the top-level streams and their children on ``workers`` threads."""
+        self.logger.info(
+            "Syncing %d streams with %d workers", len(root_streams), workers
+        )
+        self.stop_syncing.clear()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._sync_stream_tree, stream)
+                for stream in root_streams
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                # The trees already running stop before their next page
+                self.stop_syncing.set()
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _defer_stream_tree(self, stream: streams.ZohoInventoryStream) -> bool:
+        """Return whether a top-level stream can wait and the daily budget is
+        short of the calls it and its children made in their latest run."""
+        quota = self.quota
+        if not stream.deferrable or quota is None:
+            return False
+        tree = stream._stream_tree()
+        if not quota.defer(tree):
+            return False
+        self.logger.warning(
+            "Stream '%s': deferred, its latest run made %d API calls and %d are "
+            "left in today's budget",
+            stream.name,
+            quota.projected(tree),
+            quota.remaining,
+        )
+        return True
+
+    def _sync_stream_tree(self, stream: streams.ZohoInventoryStream) -> None:
+        """Sync a top-level stream and its children."""
+        if self._defer_stream_tree(stream):
+            return
+        stream.sync()
+        with self.output_lock:
+            stream.finalize_state_progress_markers()
+            stream._write_state_message()
 
 
 if __name__ == "__main__":
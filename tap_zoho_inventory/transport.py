@@ -0,0 +1,108 @@
+"""HTTP session shared by every zoho-inventory stream."""
+
+from __future__ import annotations
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from singer_sdk.exceptions import ConfigValidationError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def pool_size(config: dict) -> int:
+    """Return the number of connections needed by the configured concurrency.
+
+    Every parent stream syncing at the same time, one per parallel stream and
+    per backfill window, requests its list pages and ``detail_concurrency``
+    detail documents at once.
+    """
+    if config.get("http_pool_size"):
+        return config["http_pool_size"]
+    parents = max(1, config.get("parallel_streams", 1)) * max(
+        1, config.get("backfill_workers", 1)
+    )
+    return max(10, parents * (max(1, config.get("detail_concurrency", 4)) + 1))
+
+
+def build_session(config: dict) -> requests.Session:
+    """Return a session keeping enough warm connections for every worker.
+
+    The pool blocks when all its connections are busy, so concurrent requests
+    wait for a kept-alive connection rather than opening (and handshaking) a
+    throwaway one.
+    """
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    session.headers["Connection"] = "keep-alive"
+    size = pool_size(config)
+    if config.get("http2"):
+        if httpx is None:
+            raise ConfigValidationError(
+                "The http2 setting requires httpx with HTTP/2 support, install it "
+                "with `pip install 'tap-zoho-inventory[http2]'`."
+            )
+        adapter: BaseAdapter = HTTPXAdapter(pool_size=size)
+    else:
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=size, pool_block=True)
+    session.mount("https://", adapter)
+    return session
+
+
+class HTTPXAdapter(BaseAdapter):
+    """Send ``requests`` requests through an HTTP/2 ``httpx`` client."""
+
+    def __init__(self, pool_size: int) -> None:
+        super().__init__()
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,  # noqa: ARG002
+        timeout=None,
+        verify=True,  # noqa: ARG002
+        cert=None,  # noqa: ARG002
+        proxies=None,  # noqa: ARG002
+    ) -> requests.Response:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        try:
+            response = self.client.request(
+                request.method,
+                request.url,
+                headers=dict(request.headers),
+                content=request.body,
+                timeout=timeout,
+            )
+        except httpx.TimeoutException as ex:
+            raise requests.exceptions.ReadTimeout(ex, request=request) from ex
+        except httpx.TransportError as ex:
+            raise requests.exceptions.ConnectionError(ex, request=request) from ex
+
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict(response.headers)
+        # httpx already decoded gzip/deflate bodies
+        result._content = response.content
+        # and read them whole, even when requests asked to stream them
+        result._content_consumed = True
+        result.encoding = response.encoding
+        result.url = str(response.url)
+        result.request = request
+        result.elapsed = response.elapsed
+        result.connection = self
+        return result
+
+    def close(self) -> None:
+        self.client.close()
@@ -1,3 +1,25 @@
 """Test Configuration."""
 
+import pytest
+
+from tests.mock_api import ZohoMockAdapter, mock_zoho
+
 pytest_plugins = ("singer_sdk.testing.pytest_plugin",)
+
+_offline = mock_zoho()
+
+
+def pytest_configure(config):
+    # The SDK test classes instantiate the tap at collection time already
+    _offline.__enter__()
+
+
+def pytest_unconfigure(config):
+    _offline.__exit__(None, None, None)
+
+
+@pytest.fixture
+def zoho_api():
+    """Return a fresh Zoho stand-in, e.g. to count requests or inject failures."""
+    with mock_zoho(ZohoMockAdapter()) as adapter:
+        yield adapter
@@ -0,0 +1,411 @@
+"""Offline stand-in for the Zoho Inventory API.
+
+`ZohoMockAdapter` is a ``requests`` transport adapter serving synthetic
+responses for every path requested by the tap: the OAuth token endpoint, the
+account preferences, the paginated lists and the detail documents. It can also
+answer with 429s carrying a ``Retry-After`` header and with 5xx errors, so
+retries and throttling can be exercised without network access.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+API_PREFIX = "/inventory/v1"
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+FIRST_MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+CUSTOM_FIELD = "cf_channel"
+
+# Tap settings for a sync against the stand-in
+MOCK_CONFIG = {
+    "client_id": "mock-client-id",
+    "client_secret": "mock-client-secret",
+    "refresh_token": "mock-refresh-token",
+    "redirect_uri": "http://localhost",
+    "start_date": "2023-01-01T00:00:00Z",
+    "page_size": 10,
+    # The stand-in doesn't throttle, neither should the tap
+    "requests_per_minute": 60000,
+    "rate_limit_burst": 1000,
+}
+
+
+@dataclass(frozen=True)
+class Resource:
+    """How Zoho shapes the list and detail responses of a resource."""
+
+    list_key: str
+    report_name: str
+    detail_key: str
+    id_field: str
+    fields: tuple = ()
+    detail_id_field: str | None = None
+    detail_resource: str | None = None
+    line_items: bool = False
+    custom_fields: bool = False
+    extra: dict = field(default_factory=dict)
+    line_item_extra: dict = field(default_factory=dict)
+    # Fields sent before the id, e.g. the group of grouped items
+    leading: dict = field(default_factory=dict)
+
+
+RESOURCES = {
+    "items": Resource(
+        list_key="items",
+        report_name="Items",
+        detail_key="item",
+        id_field="item_id",
+        fields=("name", "status", "created_time"),
+        custom_fields=True,
+        leading={"group_id": "8000000000001", "group_name": "Bottles"},
+    ),
+    "salesorders": Resource(
+        list_key="salesorders",
+        report_name="Sales Orders",
+        detail_key="salesorder",
+        id_field="salesorder_id",
+        fields=("date", "status", "total", "created_time"),
+        line_items=True,
+        custom_fields=True,
+    ),
+    "purchaseorders": Resource(
+        list_key="purchaseorders",
+        report_name="Purchase Orders",
+        detail_key="purchaseorder",
+        id_field="purchaseorder_id",
+        fields=("date", "status", "total", "created_time"),
+        line_items=True,
+        custom_fields=True,
+    ),
+    # Vendors are listed under `contacts` and detailed at `/contacts/{id}`
+    "vendors": Resource(
+        list_key="contacts",
+        report_name="Vendors",
+        detail_key="contact",
+        id_field="contact_id",
+        fields=("status", "created_time"),
+        detail_resource="contacts",
+        custom_fields=True,
+    ),
+    "purchasereceives": Resource(
+        list_key="purchasereceives",
+        report_name="Purchase Receives",
+        detail_key="purchasereceive",
+        id_field="purchasereceive_id",
+        fields=("status", "created_time"),
+        detail_id_field="receive_id",
+        line_items=True,
+    ),
+    "compositeitems": Resource(
+        list_key="composite_items",
+        report_name="Composite Items",
+        detail_key="composite_item",
+        id_field="composite_item_id",
+        fields=("name", "status"),
+        custom_fields=True,
+    ),
+    "bundles": Resource(
+        list_key="bundles",
+        report_name="Bundles",
+        detail_key="bundle",
+        id_field="bundle_id",
+        fields=("date", "status", "total", "created_time"),
+        line_items=True,
+        extra={"composite_item_id": "9000000000001"},
+        line_item_extra={"quantity_consumed": 1},
+    ),
+}
+DETAIL_RESOURCES = {
+    resource.detail_resource or name: name for name, resource in RESOURCES.items()
+}
+
+
+class ZohoMockAdapter(BaseAdapter):
+    """Serve synthetic Zoho Inventory responses.
+
+    Every resource holds ``records`` records, ``minutes_apart`` minutes apart
+    from 2024-01-01 on, and honours the ``page``, ``per_page``, ``sort_order`` and
+    ``last_modified_time`` parameters the tap sends.
+
+    Args:
+        records: Number of records of every resource.
+        line_items: Number of line items of every order detail document.
+        latency: Seconds spent answering every request.
+        rate_limit_every: Answer every n-th API request with a 429.
+        server_error_every: Answer every n-th API request with a 500.
+        retry_after: ``Retry-After`` header sent with the 429s.
+        bulk_details: Serve `/itemdetails`, the bulk item details endpoint.
+        minutes_apart: Minutes between the modification times of the records.
+        sorts_lists: Honour ``sort_order``, list pages are always oldest first
+            otherwise.
+    """
+
+    def __init__(
+        self,
+        records: int = 25,
+        line_items: int = 3,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        server_error_every: int = 0,
+        retry_after: str = "1",
+        bulk_details: bool = True,
+        minutes_apart: int = 1,
+        sorts_lists: bool = True,
+    ) -> None:
+        super().__init__()
+        self.records = records
+        self.line_items = line_items
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.server_error_every = server_error_every
+        self.retry_after = retry_after
+        self.bulk_details = bulk_details
+        self.minutes_apart = minutes_apart
+        self.sorts_lists = sorts_lists
+        self.calls: Counter = Counter()
+        self.bytes_sent = 0
+        self._failures: list = []
+        self._fail_all: int | None = None
+        self._api_requests = 0
+        self._lock = threading.Lock()
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        """Answer the next ``count`` API requests with ``status``."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def fail_after(self, count: int, status: int) -> None:
+        """Answer every API request after the next ``count`` with ``status``."""
+        with self._lock:
+            self._failures.extend([None] * count)
+            self._fail_all = status
+
+    @property
+    def total_calls(self) -> int:
+        """Return the number of requests answered, token requests excluded."""
+        return sum(n for path, n in self.calls.items() if path != "/oauth/v2/token")
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = self._send(request)
+        if kwargs.get("stream"):
+            # Leave the body to be read from `raw`, like urllib3 does
+            response.raw = io.BytesIO(response._content)
+            response._content = False
+        return response
+
+    def _send(self, request: requests.PreparedRequest) -> requests.Response:
+        url = urlparse(request.url)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        if self.latency:
+            time.sleep(self.latency)
+
+        if path == "/oauth/v2/token":
+            with self._lock:
+                self.calls[path] += 1
+            return self._response(
+                request, 200, {"access_token": "mock-token", "expires_in": 3600}
+            )
+
+        status = self._injected_failure()
+        parts = path.strip("/").split("/")
+        if parts[0] in DETAIL_RESOURCES and len(parts) == 2:
+            template = f"/{parts[0]}/{{id}}"
+        else:
+            template = "/" + "/".join(parts)
+        with self._lock:
+            self.calls[template] += 1
+        if status == 429:
+            return self._response(
+                request,
+                429,
+                {"code": 43, "message": "You have made too many requests."},
+                {"Retry-After": self.retry_after},
+            )
+        if status:
+            return self._response(
+                request, status, {"code": 500, "message": "Internal error."}
+            )
+
+        if path.rstrip("/") == "/settings/preferences":
+            return self._response(request, 200, self.preferences())
+        if path == "/itemdetails" and self.bulk_details:
+            details = [
+                self.detail("items", item_id)
+                for item_id in params.get("item_ids", "").split(",")
+            ]
+            return self._response(
+                request,
+                200,
+                {"code": 0, "items": [body["item"] for body in details if body]},
+            )
+        if len(parts) == 1 and parts[0] in RESOURCES:
+            return self._response(request, 200, self.list_page(parts[0], params))
+        if len(parts) == 2 and parts[0] in DETAIL_RESOURCES:
+            body = self.detail(DETAIL_RESOURCES[parts[0]], parts[1])
+            if body is not None:
+                return self._response(request, 200, body)
+        return self._response(
+            request, 404, {"code": 5, "message": "Invalid URL Passed"}
+        )
+
+    def close(self) -> None:
+        pass
+
+    def _injected_failure(self) -> int | None:
+        with self._lock:
+            self._api_requests += 1
+            if self._failures:
+                return self._failures.pop(0)
+            if self._fail_all:
+                return self._fail_all
+            if self.rate_limit_every and self._api_requests % self.rate_limit_every == 0:
+                return 429
+            if self.server_error_every and self._api_requests % self.server_error_every == 0:
+                return 500
+        return None
+
+    def preferences(self) -> dict:
+        custom_field = {
+            "api_name": CUSTOM_FIELD,
+            "label": "Channel",
+            "data_type": "string",
+        }
+        return {
+            "code": 0,
+            "customfields": {
+                "salesorder": [custom_field],
+                "purchaseorder": [custom_field],
+            },
+        }
+
+    def record(self, name: str, index: int, detailed: bool = False) -> dict:
+        """Return the list record, or the detail document, of a resource."""
+        resource = RESOURCES[name]
+        modified = FIRST_MODIFIED + timedelta(minutes=index * self.minutes_apart)
+        record_id = str(1000000000000 * (list(RESOURCES).index(name) + 1) + index)
+        id_field = resource.id_field
+        if detailed and resource.detail_id_field:
+            id_field = resource.detail_id_field
+        record = {
+            **resource.leading,
+            id_field: record_id,
+            "last_modified_time": modified.strftime(TIME_FORMAT),
+        }
+        values = {
+            "name": f"{name} {index}",
+            "status": "confirmed",
+            "date": modified.strftime("%Y-%m-%d"),
+            "total": round(10.5 * (index + 1), 2),
+            "created_time": modified.strftime(TIME_FORMAT),
+        }
+        record.update((key, values[key]) for key in resource.fields)
+        record.update(resource.extra)
+        if detailed and resource.custom_fields:
+            record["custom_fields"] = [
+                {"api_name": CUSTOM_FIELD, "label": "Channel", "value": "web"},
+                {"api_name": "cf_notes", "label": "Notes", "value": ""},
+            ]
+        if detailed and resource.line_items:
+            record["line_items"] = [
+                {
+                    "line_item_id": f"{record_id}{line:03d}",
+                    "item_id": str(1000000000000 + line),
+                    "name": f"items {line}",
+                    "description": "",
+                    "quantity": line + 1,
+                    "rate": 12.5,
+                    **resource.line_item_extra,
+                }
+                for line in range(self.line_items)
+            ]
+        return record
+
+    def list_page(self, name: str, params: dict) -> dict:
+        resource = RESOURCES[name]
+        records = [self.record(name, index) for index in range(self.records)]
+        modified_since = params.get("last_modified_time")
+        if modified_since:
+            since = datetime.strptime(modified_since, TIME_FORMAT)
+            records = [
+                record for record in records
+                if datetime.strptime(record["last_modified_time"], TIME_FORMAT) >= since
+            ]
+        if self.sorts_lists and params.get("sort_order") == "D":
+            records.reverse()
+        page = int(params.get("page", 1))
+        per_page = int(params.get("per_page", 200))
+        page_records = records[(page - 1) * per_page : page * per_page]
+        return {
+            "code": 0,
+            "message": "success",
+            resource.list_key: page_records,
+            "page_context": {
+                "page": page,
+                "per_page": per_page,
+                "has_more_page": page * per_page < len(records),
+                "report_name": resource.report_name,
+                "sort_column": params.get("sort_column", "created_time"),
+                "sort_order": params.get("sort_order", "D"),
+            },
+        }
+
+    def detail(self, name: str, record_id: str) -> dict | None:
+        resource = RESOURCES[name]
+        index = int(record_id) - 1000000000000 * (list(RESOURCES).index(name) + 1)
+        if not 0 <= index < self.records:
+            return None
+        return {
+            "code": 0,
+            "message": "success",
+            resource.detail_key: self.record(name, index, detailed=True),
+        }
+
+    def _response(
+        self,
+        request: requests.PreparedRequest,
+        status: int,
+        body: dict,
+        headers: dict | None = None,
+    ) -> requests.Response:
+        content = json.dumps(body).encode()
+        with self._lock:
+            self.bytes_sent += len(content)
+        response = requests.Response()
+        response.status_code = status
+        response.reason = requests.status_codes._codes[status][0].upper()
+        response._content = content
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/json;charset=UTF-8", **(headers or {})}
+        )
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=self.latency)
+        response.connection = self
+        return response
+
+
+@contextmanager
+def mock_zoho(adapter: ZohoMockAdapter | None = None) -> Iterator[ZohoMockAdapter]:
+    """Route every ``requests`` session to a `ZohoMockAdapter`."""
+    adapter = adapter or ZohoMockAdapter()
+    get_adapter = requests.Session.get_adapter
+    requests.Session.get_adapter = lambda session, url: adapter
+    try:
+        yield adapter
+    finally:
+        requests.Session.get_adapter = get_adapter
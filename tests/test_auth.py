@@ -0,0 +1,66 @@
+"""Tests for the OAuth token refresh."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tap_zoho_inventory.auth import ZohoInventoryAuthenticator
+from tap_zoho_inventory.tap import TapZohoInventory
+from tests.mock_api import MOCK_CONFIG
+
+TOKEN_PATH = "/oauth/v2/token"
+
+
+@pytest.fixture
+def new_authenticator(monkeypatch, zoho_api):
+    """Return a factory of authenticators that don't share the tap's singleton."""
+
+    def create(**config):
+        stream = TapZohoInventory(config={**MOCK_CONFIG, **config}).streams["contacts"]
+        monkeypatch.setattr(
+            ZohoInventoryAuthenticator, "_SingletonMeta__single_instance", None
+        )
+        zoho_api.calls.clear()
+        return ZohoInventoryAuthenticator.create_for_stream(
+            stream, auth_endpoint="https://accounts.zoho.com/oauth/v2/token"
+        )
+
+    return create
+
+
+def test_concurrent_requests_refresh_once(new_authenticator, zoho_api):
+    authenticator = new_authenticator()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        headers = list(executor.map(lambda _: authenticator.auth_headers, range(32)))
+
+    assert zoho_api.calls[TOKEN_PATH] == 1
+    assert {h["Authorization"] for h in headers} == {"Zoho-oauthtoken mock-token"}
+
+
+def test_refreshes_ahead_of_expiry(new_authenticator, zoho_api):
+    authenticator = new_authenticator(token_refresh_margin=300)
+    authenticator.auth_headers
+
+    authenticator._expires_at = time.time() + 200
+    assert authenticator.auth_headers["Authorization"] == "Zoho-oauthtoken mock-token"
+
+    assert zoho_api.calls[TOKEN_PATH] == 2
+    assert authenticator._expires_at > time.time() + 3000
+
+
+def test_token_cache_skips_refresh(new_authenticator, zoho_api, tmp_path):
+    cache_path = str(tmp_path / "token.json")
+    new_authenticator(token_cache_path=cache_path).auth_headers
+    assert zoho_api.calls[TOKEN_PATH] == 1
+
+    authenticator = new_authenticator(token_cache_path=cache_path)
+    assert authenticator.auth_headers["Authorization"] == "Zoho-oauthtoken mock-token"
+    assert zoho_api.calls[TOKEN_PATH] == 0
+
+    other_credentials = new_authenticator(
+        token_cache_path=cache_path, refresh_token="other-refresh-token"
+    )
+    other_credentials.auth_headers
+    assert zoho_api.calls[TOKEN_PATH] == 1
@@ -0,0 +1,77 @@
+"""Tests for the schema loading and the compiled record conformance."""
+
+import copy
+import datetime
+import logging
+
+import pytest
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import TypeConformanceLevel, _conform_record_data_types
+
+from tap_zoho_inventory.client import load_schema
+from tap_zoho_inventory.conform import compile_conformer
+from tap_zoho_inventory.tap import TapZohoInventory
+from tests.mock_api import MOCK_CONFIG
+
+RECORD = {
+    "salesorder_id": "1",
+    "date": datetime.date(2023, 1, 2),
+    "has_discount": 0,
+    "is_emailed": "",
+    "is_dropshipped": None,
+    "is_backordered": True,
+    "discount": 1.5,
+    "not_in_schema": "x",
+    "billing_address": {"city": "Austin", "planet": "Earth"},
+    "line_items": [
+        {"line_item_id": "11", "quantity": 2, "extra": 1},
+        {"line_item_id": "12", "quantity": 0},
+    ],
+    "custom_fields": [{"label": "Channel", "value": "web"}],
+    "cf_channel": "web",
+}
+
+
+@pytest.fixture
+def stream():
+    return TapZohoInventory(config=MOCK_CONFIG).streams["sales_orders_details"]
+
+
+def sdk_conform(record, schema, mask, level):
+    record = copy.deepcopy(record)
+    pop_deselected_record_properties(record, schema, mask, logging.getLogger())
+    return _conform_record_data_types(record, schema, level, None)
+
+
+@pytest.mark.parametrize(
+    "level", [TypeConformanceLevel.RECURSIVE, TypeConformanceLevel.ROOT_ONLY]
+)
+def test_conformer_matches_sdk(stream, level):
+    mask = copy.copy(stream.mask)
+    mask[("properties", "discount")] = False
+    mask[("properties", "billing_address", "properties", "city")] = False
+
+    conformed, unmapped = compile_conformer(stream.schema, mask, level)(
+        copy.deepcopy(RECORD)
+    )
+    expected, expected_unmapped = sdk_conform(RECORD, stream.schema, mask, level)
+
+    assert conformed == expected
+    assert unmapped == expected_unmapped
+    assert "discount" not in conformed
+    assert conformed["has_discount"] is False
+    assert conformed["is_emailed"] is True
+
+
+def test_conformer_keeps_record_untouched(stream):
+    record = copy.deepcopy(RECORD)
+    compile_conformer(stream.schema, stream.mask)(record)
+    assert record == RECORD
+
+
+def test_custom_fields_leave_cached_schema_untouched(stream):
+    cached = load_schema(type(stream).schema_filepath)
+
+    assert "cf_channel" in stream.schema["properties"]
+    assert "cf_channel" not in cached["properties"]
+    assert stream.schema["properties"]["line_items"] is cached["properties"]["line_items"]
@@ -0,0 +1,92 @@
+"""Tests for the buffered RECORD writer."""
+
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from singer_sdk._singerlib.messages import RecordMessage, format_message
+
+from tap_zoho_inventory import output
+from tap_zoho_inventory.output import MessageWriter
+from tests.test_replay import sync_messages
+
+RECORD = {
+    "salesorder_id": "1",
+    "customer_name": "Café Zoë",
+    "total": 12.5,
+    "line_items": [{"line_item_id": "11", "quantity": 2, "description": None}],
+    "is_emailed": True,
+}
+TIME_EXTRACTED = datetime.datetime(2024, 3, 1, 12, 30, 5, 123, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture(params=["orjson", "simplejson"])
+def writer(request, monkeypatch):
+    if request.param == "simplejson":
+        monkeypatch.setattr(output, "orjson", None)
+    elif output.orjson is None:
+        pytest.skip("orjson is not installed")
+    return MessageWriter()
+
+
+@pytest.mark.parametrize("time_extracted", [TIME_EXTRACTED, None])
+def test_lines_read_like_the_sdk_messages(writer, time_extracted):
+    line = writer.encode_record("sales_orders", RECORD, time_extracted)
+    message = RecordMessage(
+        stream="sales_orders", record=RECORD, time_extracted=time_extracted
+    )
+
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line) == json.loads(format_message(message))
+
+
+def test_decimals_stay_exact(writer):
+    line = writer.encode_record("sales_orders", {"total": Decimal("10.10")}, None)
+
+    assert b'"total":10.10' in line
+
+
+def test_lines_are_buffered_until_flushed(writer, monkeypatch):
+    stdout = io.StringIO()
+    monkeypatch.setattr("sys.stdout", stdout)
+    writer.buffer_size = 1000
+    line = writer.encode_record("sales_orders", RECORD, None)
+
+    writer.write([line])
+    assert stdout.getvalue() == ""
+    writer.write([line] * 10)
+    assert stdout.getvalue() == line.decode() * 11
+    writer.write([line])
+    writer.flush()
+    assert stdout.getvalue() == line.decode() * 12
+
+
+def test_buffered_messages_keep_their_order(capsys, zoho_api):
+    def messages(**config):
+        # STATE messages differ by their signposts, only their position matters
+        return [
+            (message["type"], message.get("stream"), message.get("record"))
+            for message in sync_messages(
+                capsys, {"sales_orders", "contacts"}, checkpoint_interval=5, **config
+            )
+        ]
+
+    unbuffered = messages(output_buffer_size=0)
+    buffered = messages()
+
+    assert [message[0] for message in buffered].count("STATE") > 2
+    assert buffered == unbuffered
+
+
+def test_non_ascii_escaped_for_other_encodings(writer, monkeypatch):
+    binary = io.BytesIO()
+    stdout = io.TextIOWrapper(binary, encoding="ascii")
+    monkeypatch.setattr("sys.stdout", stdout)
+    record = {**RECORD, "customer_name": "日本 Café 🎉"}
+
+    writer.write([writer.encode_record("sales_orders", record, None)])
+    writer.flush()
+
+    assert json.loads(binary.getvalue())["record"] == record
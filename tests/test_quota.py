@@ -0,0 +1,59 @@
+"""Tests for the daily API quota accounting."""
+
+import json
+
+from tap_zoho_inventory.quota import DailyQuota
+
+
+def test_calls_add_up_over_the_day(tmp_path):
+    path = str(tmp_path / "quota.json")
+    quota = DailyQuota(path, today="2024-03-01")
+    for _ in range(3):
+        quota.record("sales_orders")
+    quota.save()
+
+    quota = DailyQuota(path, budget=10, today="2024-03-01")
+    quota.record("sales_orders")
+
+    assert quota.used == 4
+    assert quota.remaining == 6
+    assert quota.projected(["sales_orders", "sales_orders_details"]) == 3
+
+
+def test_calls_reset_the_next_day(tmp_path):
+    path = str(tmp_path / "quota.json")
+    quota = DailyQuota(path, today="2024-03-01")
+    quota.record("assembly_orders")
+    quota.save()
+
+    quota = DailyQuota(path, budget=1, today="2024-03-02")
+
+    assert quota.used == 0
+    assert quota.projected(["assembly_orders"]) == 1
+    assert not quota.defer(["assembly_orders"])
+    quota.record("sales_orders")
+    assert quota.defer(["assembly_orders"])
+    assert quota.deferred == ["assembly_orders"]
+
+
+def test_deferred_streams_keep_their_projection(tmp_path):
+    path = tmp_path / "quota.json"
+    quota = DailyQuota(str(path), today="2024-03-01")
+    quota.record("assembly_orders")
+    quota.save()
+
+    quota = DailyQuota(str(path), today="2024-03-01")
+    quota.record("sales_orders")
+    quota.save()
+
+    assert json.loads(path.read_text())["latest_runs"] == {
+        "assembly_orders": 1,
+        "sales_orders": 1,
+    }
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / "quota.json"
+    path.write_text("{")
+
+    assert DailyQuota(str(path), budget=5).remaining == 5
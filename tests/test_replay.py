@@ -0,0 +1,788 @@
+"""Sync the tap against the offline Zoho stand-in."""
+
+import datetime
+import json
+import logging
+import logging.handlers
+import threading
+import time
+
+import backoff
+import pytest
+import requests
+from singer_sdk.exceptions import ConfigValidationError, FatalAPIError, RetriableAPIError
+
+from tap_zoho_inventory import transport
+from tap_zoho_inventory.client import ZohoInventoryStream, _BackgroundIterator
+from tap_zoho_inventory.instrumentation import SyncMetrics
+from tap_zoho_inventory.tap import TapZohoInventory
+from tests.mock_api import FIRST_MODIFIED, MOCK_CONFIG, TIME_FORMAT
+
+PREFERENCES = "/settings/preferences"
+
+
+def sync_messages(capsys, selected, before_sync=None, state=None, **config):
+    """Sync the selected streams, returning the Singer messages written."""
+    config = {**MOCK_CONFIG, **config}
+    catalog = TapZohoInventory(config=config).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in selected
+    tap = TapZohoInventory(config=config, catalog=catalog, state=state)
+    if before_sync:
+        before_sync()
+    capsys.readouterr()
+    tap.sync_streams()
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def sync(capsys, selected, before_sync=None, state=None, **config):
+    """Sync the selected streams, returning the records emitted per stream."""
+    records = {}
+    for message in sync_messages(capsys, selected, before_sync, state, **config):
+        if message["type"] == "RECORD":
+            records.setdefault(message["stream"], []).append(message["record"])
+    return records
+
+
+@pytest.fixture
+def no_backoff_wait(monkeypatch):
+    monkeypatch.setattr(
+        ZohoInventoryStream, "backoff_wait_generator", lambda self: backoff.constant(0)
+    )
+
+
+def test_sales_orders_details_fetched_once(capsys, zoho_api):
+    records = sync(capsys, {"sales_orders", "sales_orders_details"})
+
+    assert len(records["sales_orders"]) == zoho_api.records
+    assert len(records["sales_orders_details"]) == zoho_api.records
+    assert zoho_api.calls["/salesorders"] == 3
+    assert zoho_api.calls["/salesorders/{id}"] == zoho_api.records
+    record = records["sales_orders_details"][0]
+    assert record["cf_channel"] == "web"
+    assert record["line_items"][0]["description"] is None
+
+
+@pytest.mark.parametrize("selected", [{"product_details"}, {"products", "product_details"}])
+def test_product_details_fetched_in_bulk(capsys, zoho_api, selected):
+    records = sync(capsys, selected)
+
+    assert len(records["product_details"]) == zoho_api.records
+    assert zoho_api.calls["/itemdetails"] == 3
+    assert zoho_api.calls["/items/{id}"] == 0
+    assert records["product_details"][0]["custom_fields"] == [
+        {"api_name": "cf_channel", "label": "Channel", "value": "web"},
+        {"api_name": "cf_notes", "label": "Notes", "value": None},
+    ]
+
+
+def test_product_details_without_bulk_endpoint(capsys, zoho_api):
+    zoho_api.bulk_details = False
+
+    records = sync(capsys, {"product_details"})
+
+    assert len(records["product_details"]) == zoho_api.records
+    assert zoho_api.calls["/itemdetails"] == 1
+    assert zoho_api.calls["/items/{id}"] == zoho_api.records
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retries_throttled_and_failed_requests(capsys, zoho_api, no_backoff_wait, status):
+    zoho_api.retry_after = "0"
+    zoho_api.fail_next(status, count=2)
+
+    records = sync(capsys, {"contacts"})
+
+    assert len(records["contacts"]) == zoho_api.records
+
+
+def test_retry_budget(capsys, zoho_api, no_backoff_wait):
+    with pytest.raises(RetriableAPIError):
+        sync(
+            capsys,
+            {"contacts"},
+            before_sync=lambda: zoho_api.fail_next(500, count=3),
+            retry_budget=1,
+        )
+
+
+def test_retry_budget_charges_retries_only(zoho_api, no_backoff_wait):
+    tap = TapZohoInventory(config={**MOCK_CONFIG, "retry_budget": 10})
+    stream = tap.streams["contacts"]
+    zoho_api.fail_next(500, count=stream.backoff_max_tries())
+
+    with pytest.raises(RetriableAPIError):
+        list(stream.get_records(None))
+
+    # The last attempt fails without a retry
+    assert tap.retry_budget.remaining == 10 - (stream.backoff_max_tries() - 1)
+
+
+def test_retry_budget_exhausted_by_details(capsys, zoho_api, no_backoff_wait):
+    zoho_api.records = 5
+
+    with pytest.raises(RetriableAPIError):
+        sync(
+            capsys,
+            {"sales_orders"},
+            # The preferences and the list page go through, every detail fails
+            before_sync=lambda: zoho_api.fail_after(2, 500),
+            retry_budget=2,
+        )
+
+
+def test_retry_waits_honour_retry_after_once(zoho_api):
+    stream = TapZohoInventory(config=MOCK_CONFIG).streams["contacts"]
+    waits = stream.backoff_wait_generator()
+    next(waits)
+
+    def failure(status):
+        response = requests.Response()
+        response.status_code = status
+        return RetriableAPIError("failed", response)
+
+    assert waits.send(failure(500)) <= 6
+    # The limiter already waits for Retry-After, only jitter is added
+    assert waits.send(failure(429)) <= 1
+    assert waits.send(failure(503)) <= 18
+
+
+def test_metrics_summary(capsys, zoho_api, no_backoff_wait, tmp_path):
+    summary_path = tmp_path / "metrics.json"
+    zoho_api.retry_after = "0"
+
+    records = sync(
+        capsys,
+        {"sales_orders", "sales_orders_details"},
+        before_sync=lambda: zoho_api.fail_next(429),
+        metrics_summary_path=str(summary_path),
+    )
+
+    streams = json.loads(summary_path.read_text())["streams"]
+    assert streams["sales_orders"]["records"] == len(records["sales_orders"])
+    assert sum(stream["retries"] for stream in streams.values()) == 1
+    endpoints = streams["sales_orders"]["endpoints"]
+    assert endpoints["/salesorders"]["requests"] == zoho_api.calls["/salesorders"]
+    assert endpoints["/salesorders/{id}"]["requests"] == zoho_api.records
+    assert endpoints["/salesorders/{id}"]["bytes"] > 0
+
+
+def test_prometheus_label_values_are_escaped():
+    endpoint = {"statuses": {"200": 1}, "seconds": 0.5, "max_seconds": 0.5, "bytes": 10}
+    summary = {
+        "wall_seconds": 1.0,
+        "cpu_seconds": 0.5,
+        "streams": {
+            'odd "name"': {
+                "records": 1,
+                "retries": 0,
+                "rate_limit_wait_seconds": 0,
+                "backoff_wait_seconds": 0,
+                "endpoints": {"/a\\b\nc": endpoint},
+            }
+        },
+    }
+
+    text = SyncMetrics._prometheus(summary)
+
+    assert 'stream="odd \\"name\\""' in text
+    assert 'endpoint="/a\\\\b\\nc"' in text
+    assert len(text.splitlines()) == 4 + 2 * 8
+
+
+def test_payloads_stay_out_of_info_logs(capsys, zoho_api):
+    zoho_api.records = 0
+    handler = logging.handlers.BufferingHandler(capacity=10000)
+    logger = logging.getLogger(TapZohoInventory.name)
+    logger.addHandler(handler)
+    try:
+        sync(capsys, {"sales_orders", "contacts"})
+    finally:
+        logger.removeHandler(handler)
+
+    messages = [r.getMessage() for r in handler.buffer if r.levelno >= logging.INFO]
+    assert messages
+    assert not [m for m in messages if "page_context" in m or "Request URL" in m]
+
+
+@pytest.mark.parametrize("status", [429, 500, 404])
+def test_error_bodies_stay_out_of_warnings(capsys, zoho_api, no_backoff_wait, status):
+    zoho_api.retry_after = "0"
+    handler = logging.handlers.BufferingHandler(capacity=10000)
+    logger = logging.getLogger(TapZohoInventory.name)
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    try:
+        sync(capsys, {"contacts"}, before_sync=lambda: zoho_api.fail_next(status))
+    except FatalAPIError:
+        pass
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+    warnings = [r.getMessage() for r in handler.buffer if r.levelno == logging.WARNING]
+    failures = [m for m in warnings if f"status code {status}" in m]
+    assert failures and "https://www.zohoapis.com/inventory/v1/" in failures[0]
+    assert not [m for m in warnings if "too many requests" in m or "Internal error" in m]
+    debug = [r.getMessage() for r in handler.buffer if r.levelno == logging.DEBUG]
+    assert [m for m in debug if "response body" in m]
+
+
+def test_preferences_cache(capsys, zoho_api, tmp_path):
+    cache_path = tmp_path / "preferences.json"
+    expected = sync(capsys, {"sales_orders"}, preferences_cache_path=str(cache_path))
+    assert zoho_api.calls[PREFERENCES] == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+    records = sync(capsys, {"sales_orders"}, preferences_cache_path=str(cache_path))
+
+    assert records == expected
+    assert zoho_api.calls[PREFERENCES] == 1
+
+
+def test_preferences_cache_expires(capsys, zoho_api, tmp_path):
+    cache_path = tmp_path / "preferences.json"
+    config = {"preferences_cache_path": str(cache_path), "preferences_cache_ttl": 60}
+    sync(capsys, {"contacts"}, **config)
+    cached = json.loads(cache_path.read_text())
+    cached["fetched_at"] -= 61
+    cache_path.write_text(json.dumps(cached))
+
+    sync(capsys, {"contacts"}, **config)
+
+    assert zoho_api.calls[PREFERENCES] == 2
+    assert json.loads(cache_path.read_text())["fetched_at"] > cached["fetched_at"] + 60
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{\"organization_id\": ",
+        "[]",
+        # Missing custom fields, fetch time
+        json.dumps(
+            {"organization_id": MOCK_CONFIG.get("organization_id"), "fetched_at": time.time()}
+        ),
+        json.dumps({"organization_id": MOCK_CONFIG.get("organization_id"), "customfields": {}}),
+    ],
+)
+def test_unreadable_preferences_cache_is_a_miss(capsys, zoho_api, tmp_path, content):
+    cache_path = tmp_path / "preferences.json"
+    cache_path.write_text(content)
+
+    records = sync(capsys, {"sales_orders"}, preferences_cache_path=str(cache_path))
+
+    assert records["sales_orders"][0]["cf_channel"] == "web"
+    assert zoho_api.calls[PREFERENCES] == 1
+    assert "customfields" in json.loads(cache_path.read_text())
+
+
+def test_streams_share_a_pooled_session():
+    config = {**MOCK_CONFIG, "detail_concurrency": 8, "parallel_streams": 2}
+    tap = TapZohoInventory(config=config)
+
+    sessions = {id(stream.requests_session) for stream in tap.streams.values()}
+    assert sessions == {id(tap.requests_session)}
+    assert tap.requests_session.adapters["https://"]._pool_maxsize == 18
+
+
+def test_parallel_streams_match_a_serial_sync(capsys, zoho_api):
+    selected = {
+        "sales_orders",
+        "sales_orders_details",
+        "purchase_orders",
+        "purchase_orders_details",
+        "products",
+        "product_details",
+        "contacts",
+    }
+
+    def bookmarks(messages):
+        state = final_state(messages)
+        return {
+            stream: {
+                key: value
+                for key, value in stream_state.items()
+                if key != "replication_key_signpost"
+            }
+            for stream, stream_state in state["bookmarks"].items()
+            # Parallel syncs create every bookmark up front
+            if stream_state
+        }
+
+    def records(messages):
+        return sorted(
+            (message["stream"], json.dumps(message["record"], sort_keys=True))
+            for message in messages
+            if message["type"] == "RECORD"
+        )
+
+    serial = sync_messages(capsys, selected)
+    parallel = sync_messages(capsys, selected, parallel_streams=3, detail_concurrency=4)
+
+    assert records(parallel) == records(serial)
+    assert bookmarks(parallel) == bookmarks(serial)
+    assert {"sales_orders", "purchase_orders", "products", "contacts"} <= set(
+        bookmarks(parallel)
+    )
+
+
+def test_parallel_streams_stop_once_one_fails(capsys, zoho_api, monkeypatch):
+    send = zoho_api._send
+
+    def fail_purchase_orders(request):
+        if "/purchaseorders" in request.url:
+            return zoho_api._response(request, 400, {"code": 5, "message": "Invalid"})
+        return send(request)
+
+    monkeypatch.setattr(zoho_api, "_send", fail_purchase_orders)
+    zoho_api.latency = 0.05
+
+    with pytest.raises(FatalAPIError):
+        sync(capsys, {"contacts", "purchase_orders"}, parallel_streams=2, page_size=1)
+
+    assert zoho_api.calls["/vendors"] < zoho_api.records
+
+
+def test_sdk_sync_all_emits_every_record(capsys, zoho_api, monkeypatch, tmp_path):
+    selected = {"sales_orders", "sales_orders_details", "contacts"}
+    quota_path = tmp_path / "quota.json"
+    expected = sync_messages(capsys, selected)
+    # sync_all runs instead of sync_streams, with records left in the buffer
+    monkeypatch.setattr(TapZohoInventory, "sync_streams", lambda tap: tap.sync_all())
+
+    messages = sync_messages(
+        capsys, selected, output_buffer_size=10**9, quota_path=str(quota_path)
+    )
+
+    def records(messages):
+        return [(m["stream"], m["record"]) for m in messages if m["type"] == "RECORD"]
+
+    assert records(messages) == records(expected)
+    assert messages[-1]["type"] == "STATE"
+    assert json.loads(quota_path.read_text())["latest_runs"]["sales_orders"] > 0
+
+
+def test_cli_syncs_streams(zoho_api, monkeypatch, tmp_path):
+    synced = []
+    monkeypatch.setattr(TapZohoInventory, "sync_streams", lambda tap: synced.append(tap))
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(MOCK_CONFIG))
+
+    TapZohoInventory.cli.main(["--config", str(config_path)], standalone_mode=False)
+
+    assert len(synced) == 1
+
+
+def test_http2_without_httpx(monkeypatch):
+    monkeypatch.setattr(transport, "httpx", None)
+
+    with pytest.raises(ConfigValidationError, match="http2"):
+        transport.build_session({**MOCK_CONFIG, "http2": True})
+
+
+def test_streamed_list_pages(capsys, zoho_api, tmp_path):
+    selected = set(TapZohoInventory(config=MOCK_CONFIG).streams)
+    expected = sync(capsys, selected)
+    calls = {path: count for path, count in zoho_api.calls.items() if path != PREFERENCES}
+    zoho_api.calls.clear()
+    summary_path = tmp_path / "metrics.json"
+
+    records = sync(
+        capsys,
+        selected,
+        stream_list_pages=True,
+        metrics_summary_path=str(summary_path),
+    )
+
+    assert records == expected
+    assert {path: count for path, count in zoho_api.calls.items() if path != PREFERENCES} == calls
+    streams = json.loads(summary_path.read_text())["streams"]
+    assert streams["sales_orders"]["endpoints"]["/salesorders"]["bytes"] > 0
+
+
+def test_prefetched_list_pages(capsys, zoho_api):
+    selected = {"sales_orders", "sales_orders_details", "contacts"}
+    expected = sync(capsys, selected)
+    skipped = {PREFERENCES, "/oauth/v2/token"}
+    calls = {path: count for path, count in zoho_api.calls.items() if path not in skipped}
+    zoho_api.calls.clear()
+
+    records = sync(capsys, selected, prefetch_pages=2)
+
+    assert records == expected
+    assert {path: count for path, count in zoho_api.calls.items() if path not in skipped} == calls
+
+
+def test_prefetch_failures_reach_the_sync(capsys, zoho_api):
+    with pytest.raises(FatalAPIError):
+        sync(
+            capsys,
+            {"contacts"},
+            before_sync=lambda: zoho_api.fail_after(1, 400),
+            prefetch_pages=2,
+        )
+
+
+def test_background_iterator_hands_over_any_exception():
+    def pages():
+        yield 1
+        raise KeyboardInterrupt
+
+    items = _BackgroundIterator(pages(), maxsize=1, name="test").start()
+
+    with pytest.raises(KeyboardInterrupt):
+        for _ in items:
+            pass
+
+
+def test_child_streams_are_not_prefetched(capsys, zoho_api, monkeypatch):
+    started = []
+    start = _BackgroundIterator.start
+
+    def record_start(self):
+        started.append(self._thread.name)
+        return start(self)
+
+    monkeypatch.setattr(_BackgroundIterator, "start", record_start)
+
+    records = sync(
+        capsys, {"composite_items", "composite_items_details"}, prefetch_pages=2
+    )
+
+    assert len(records["composite_items_details"]) == zoho_api.records
+    assert started == ["composite_items-prefetch"]
+
+
+def test_closing_a_background_iterator_stops_the_producer():
+    closed = threading.Event()
+
+    def pages():
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.set()
+
+    items = _BackgroundIterator(pages(), maxsize=1, name="test").start()
+    next(iter(items))
+    items.close()
+
+    assert closed.wait(5)
+    items._thread.join(5)
+    assert not items._thread.is_alive()
+
+
+def test_streamed_list_pages_without_prefetch():
+    config = {**MOCK_CONFIG, "stream_list_pages": True, "prefetch_pages": 2}
+    stream = TapZohoInventory(config=config).streams["sales_orders"]
+
+    with pytest.raises(ConfigValidationError, match="prefetch_pages"):
+        stream._stream_pages
+
+
+@pytest.mark.parametrize(
+    "selected, details_path",
+    [
+        ({"sales_orders", "sales_orders_details"}, "/salesorders/{id}"),
+        ({"purchase_receives", "purchasereceives_details"}, "/purchasereceives/{id}"),
+        ({"purchasereceives_details"}, "/purchasereceives/{id}"),
+        ({"products", "product_details"}, "/itemdetails"),
+    ],
+)
+def test_change_index_skips_unchanged_records(capsys, zoho_api, tmp_path, selected, details_path):
+    index_path = str(tmp_path / "index.db")
+    first = sync(capsys, selected, change_index_path=index_path)
+    assert zoho_api.calls[details_path] > 0
+    zoho_api.calls.clear()
+
+    second = sync(capsys, selected, change_index_path=index_path)
+
+    assert all(first[stream] for stream in selected)
+    assert second == {}
+    assert zoho_api.calls[details_path] == 0
+
+
+def test_change_index_keeps_uncommitted_records_out(capsys, zoho_api, tmp_path, monkeypatch):
+    index_path = str(tmp_path / "index.db")
+    monkeypatch.setattr(ZohoInventoryStream, "_write_state_message", lambda self: None)
+    sync(capsys, {"contacts"}, change_index_path=index_path)
+    monkeypatch.undo()
+
+    records = sync(capsys, {"contacts"}, change_index_path=index_path)
+
+    assert len(records["contacts"]) == zoho_api.records
+
+
+def test_daily_budget_defers_streams_that_can_wait(capsys, zoho_api, tmp_path):
+    quota_path = tmp_path / "quota.json"
+    selected = {"sales_orders", "assembly_orders", "composite_items"}
+    first = sync(capsys, selected, quota_path=str(quota_path))
+    saved = json.loads(quota_path.read_text())
+    sales_orders_calls = zoho_api.calls["/salesorders"] + zoho_api.calls["/salesorders/{id}"]
+    assert saved["latest_runs"]["sales_orders"] == sales_orders_calls
+    used = sum(saved["calls"].values())
+    zoho_api.calls.clear()
+
+    # Room for the sales orders and the preferences, not for the streams that can wait
+    records = sync(
+        capsys,
+        selected,
+        quota_path=str(quota_path),
+        daily_call_budget=used + sales_orders_calls + 3,
+    )
+
+    assert records == {"sales_orders": first["sales_orders"]}
+    assert zoho_api.calls["/bundles"] == zoho_api.calls["/compositeitems"] == 0
+    saved = json.loads(quota_path.read_text())
+    assert sum(saved["calls"].values()) == used + zoho_api.total_calls - 1
+    assert saved["latest_runs"]["assembly_orders"] > 1
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_backfill_resumes_after_a_crash(capsys, zoho_api, workers):
+    zoho_api.records = 60
+    zoho_api.minutes_apart = 24 * 60
+    config = {
+        "start_date": "2023-12-31T00:00:00Z",
+        "backfill_window_days": 20,
+        "backfill_workers": workers,
+        "checkpoint_interval": 5,
+    }
+    with pytest.raises(FatalAPIError):
+        sync_messages(
+            capsys,
+            {"sales_orders"},
+            before_sync=lambda: zoho_api.fail_after(50, 400),
+            **config,
+        )
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    states = [message["value"] for message in messages if message["type"] == "STATE"]
+    emitted = [
+        message["record"]["salesorder_id"]
+        for message in messages
+        if message["type"] == "RECORD"
+    ]
+    assert states and 0 < len(emitted) < zoho_api.records
+    zoho_api.fail_after(0, None)
+
+    records = sync(capsys, {"sales_orders"}, state=states[-1], **config)
+
+    resumed = [record["salesorder_id"] for record in records["sales_orders"]]
+    assert len(set(emitted) | set(resumed)) == zoho_api.records
+    assert len(set(emitted) & set(resumed)) <= config["checkpoint_interval"]
+
+
+def test_windows_fetched_ahead_stop_after_a_crash(capsys, zoho_api, monkeypatch):
+    zoho_api.records = 60
+    zoho_api.minutes_apart = 24 * 60
+    producers = []
+    start = _BackgroundIterator.start
+
+    def record_start(self):
+        producers.append(self)
+        return start(self)
+
+    def crash(stream, record):
+        raise RuntimeError("crashed")
+
+    monkeypatch.setattr(_BackgroundIterator, "start", record_start)
+    monkeypatch.setattr(ZohoInventoryStream, "_write_record_message", crash)
+
+    with pytest.raises(RuntimeError, match="crashed"):
+        sync(capsys, {"sales_orders"}, backfill_workers=3, page_size=1, **BACKFILL_CONFIG)
+
+    assert len(producers) == 2
+    for producer in producers:
+        producer._thread.join(5)
+        assert not producer._thread.is_alive()
+
+
+@pytest.mark.parametrize("stream_list_pages", [False, True])
+def test_sync_resumes_mid_page_after_a_crash(capsys, zoho_api, monkeypatch, stream_list_pages):
+    zoho_api.records = 45
+    config = {
+        "page_size": 10,
+        "checkpoint_interval": 3,
+        "stream_list_pages": stream_list_pages,
+    }
+    write_record_message = ZohoInventoryStream._write_record_message
+    written = []
+
+    def crash_on_page_three(stream, record):
+        write_record_message(stream, record)
+        written.append(record)
+        if len(written) == 23:
+            raise RuntimeError("crashed")
+
+    monkeypatch.setattr(ZohoInventoryStream, "_write_record_message", crash_on_page_three)
+    with pytest.raises(RuntimeError, match="crashed"):
+        sync_messages(capsys, {"contacts"}, **config)
+    monkeypatch.undo()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    emitted = [m["record"]["contact_id"] for m in messages if m["type"] == "RECORD"]
+    state = final_state(messages)
+    assert len(emitted) == 23
+    # Saved on page 3, after its first record
+    assert state["bookmarks"]["contacts"]["checkpoint"]["page"] == 3
+    assert state["bookmarks"]["contacts"]["checkpoint"]["offset"] == 1
+
+    records = sync(capsys, {"contacts"}, state=state, **config)
+
+    resumed = [record["contact_id"] for record in records["contacts"]]
+    assert len(set(emitted) | set(resumed)) == zoho_api.records
+    assert len(resumed) == len(set(resumed))
+    assert len(set(emitted) & set(resumed)) <= config["checkpoint_interval"]
+
+
+def test_unselected_parent_resumes_mid_page_after_a_crash(capsys, zoho_api, monkeypatch):
+    zoho_api.records = 45
+    config = {"page_size": 10, "checkpoint_interval": 1}
+    selected = {"composite_items_details"}
+    write_record_message = ZohoInventoryStream._write_record_message
+    written = []
+
+    def crash_on_page_three(stream, record):
+        write_record_message(stream, record)
+        written.append(record)
+        if len(written) == 25:
+            raise RuntimeError("crashed")
+
+    monkeypatch.setattr(ZohoInventoryStream, "_write_record_message", crash_on_page_three)
+    with pytest.raises(RuntimeError, match="crashed"):
+        sync_messages(capsys, selected, **config)
+    monkeypatch.undo()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    emitted = [m["record"]["composite_item_id"] for m in messages if m["type"] == "RECORD"]
+    state = final_state(messages)
+    assert len(emitted) == 25
+    assert state["bookmarks"]["composite_items"]["checkpoint"]["page"] == 3
+
+    records = sync(capsys, selected, state=state, **config)
+
+    resumed = [record["composite_item_id"] for record in records["composite_items_details"]]
+    assert len(set(emitted) | set(resumed)) == zoho_api.records
+    assert len(resumed) == len(set(resumed))
+    assert len(set(emitted) & set(resumed)) <= config["checkpoint_interval"]
+
+
+def purchase_receives_bookmark(index):
+    modified = FIRST_MODIFIED + datetime.timedelta(minutes=index)
+    return {
+        "bookmarks": {
+            "purchase_receives": {
+                "replication_key": "last_modified_time",
+                "replication_key_value": modified.strftime(TIME_FORMAT),
+            }
+        }
+    }
+
+
+def test_purchase_receives_stop_at_the_bookmark(capsys, zoho_api):
+    zoho_api.records = 50
+    sync(capsys, {"purchase_receives"}, page_size=10)
+    assert zoho_api.calls["/purchasereceives"] == 5
+    zoho_api.calls.clear()
+
+    records = sync(
+        capsys, {"purchase_receives"}, state=purchase_receives_bookmark(39), page_size=10
+    )
+
+    # Newest first: the second page reaches the bookmark
+    assert zoho_api.calls["/purchasereceives"] == 2
+    assert len(records["purchase_receives"]) == 10
+
+
+def test_purchase_receives_read_every_page_when_unsorted(capsys, zoho_api):
+    zoho_api.records = 50
+    zoho_api.sorts_lists = False
+
+    records = sync(
+        capsys, {"purchase_receives"}, state=purchase_receives_bookmark(39), page_size=10
+    )
+
+    assert zoho_api.calls["/purchasereceives"] == 5
+    assert len(records["purchase_receives"]) == 10
+
+
+def test_purchase_receives_check_the_sort_order_every_sync(zoho_api):
+    zoho_api.records = 50
+    config = {**MOCK_CONFIG, "page_size": 10}
+    tap = TapZohoInventory(config=config, state=purchase_receives_bookmark(39))
+    stream = tap.streams["purchase_receives"]
+    stream._write_starting_replication_value(None)
+    zoho_api.sorts_lists = False
+    list(stream.request_records(None))
+    assert not stream.sorted_by_server
+    zoho_api.sorts_lists = True
+    zoho_api.calls.clear()
+
+    list(stream.request_records(None))
+
+    assert stream.sorted_by_server
+    assert zoho_api.calls["/purchasereceives"] == 2
+
+
+def test_purchase_receives_page_without_records(zoho_api):
+    tap = TapZohoInventory(config=MOCK_CONFIG, state=purchase_receives_bookmark(39))
+    stream = tap.streams["purchase_receives"]
+    stream._write_starting_replication_value(None)
+    response = requests.Response()
+    response._content = json.dumps(
+        {"page_context": {"page": 1, "has_more_page": True}, "purchasereceives": []}
+    ).encode()
+
+    assert stream.get_next_page_token(response, None) == 2
+
+
+BACKFILL_CONFIG = {
+    "start_date": "2023-12-31T00:00:00Z",
+    "backfill_window_days": 20,
+    "checkpoint_interval": 5,
+}
+
+
+def final_state(messages):
+    return [message["value"] for message in messages if message["type"] == "STATE"][-1]
+
+
+def test_finished_windows_are_not_requested_again(capsys, zoho_api):
+    zoho_api.records = 60
+    zoho_api.minutes_apart = 24 * 60
+    first = sync_messages(capsys, {"sales_orders"}, **BACKFILL_CONFIG)
+    windows_requested = zoho_api.calls["/salesorders"]
+    zoho_api.calls.clear()
+
+    records = sync(capsys, {"sales_orders"}, state=final_state(first), **BACKFILL_CONFIG)
+
+    assert windows_requested > 10
+    # Only the window still open, the one ending after now, is requested again
+    assert zoho_api.calls["/salesorders"] == 1
+    assert records == {}
+
+
+def test_windows_start_from_an_earlier_stream_bookmark(capsys, zoho_api):
+    zoho_api.records = 60
+    zoho_api.minutes_apart = 24 * 60
+    bookmark = "2024-02-14T00:00:00+0000"
+    state = {
+        "bookmarks": {
+            "sales_orders": {
+                "replication_key": "last_modified_time",
+                "replication_key_value": bookmark,
+            }
+        }
+    }
+    tap = TapZohoInventory(config={**MOCK_CONFIG, **BACKFILL_CONFIG}, state=state)
+
+    records = sync(capsys, {"sales_orders"}, state=state, **BACKFILL_CONFIG)
+
+    modified = [record["last_modified_time"] for record in records["sales_orders"]]
+    assert len(modified) == 60 - 45
+    assert min(modified) > bookmark
+    # The first two windows ended before the bookmark
+    windows = tap.streams["sales_orders"].partitions
+    assert windows[0]["window_start"] == "2024-02-09T00:00:00+00:00"
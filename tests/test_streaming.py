@@ -0,0 +1,54 @@
+"""Tests for the incremental decoding of list pages."""
+
+import json
+
+import pytest
+
+from tap_zoho_inventory.streaming import StreamedPage
+
+PAGE = {
+    "code": 0,
+    "message": "success",
+    "salesorders": [
+        {"salesorder_id": str(i), "total": 1234.5 * i, "notes": "é" * i}
+        for i in range(20)
+    ],
+    "page_context": {"page": 2, "has_more_page": True},
+}
+
+
+def chunked(data: bytes, size: int) -> list:
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_records_decoded_across_chunks(chunk_size, indent):
+    data = json.dumps(PAGE, indent=indent, ensure_ascii=False).encode()
+    page = StreamedPage(chunked(data, chunk_size))
+
+    assert page.first() == PAGE["salesorders"][0]
+    assert list(page) == PAGE["salesorders"]
+    assert page.list_key == "salesorders"
+    assert page.finish() == {
+        "code": 0,
+        "message": "success",
+        "salesorders": [PAGE["salesorders"][-1]],
+        "page_context": PAGE["page_context"],
+    }
+    assert page.bytes_read == len(data)
+
+
+def test_page_context_read_without_iterating():
+    page = StreamedPage(chunked(json.dumps(PAGE).encode(), 16))
+
+    assert page.finish()["page_context"] == PAGE["page_context"]
+    assert list(page) == []
+
+
+def test_truncated_page():
+    data = json.dumps(PAGE).encode()
+    page = StreamedPage(chunked(data[: len(data) // 2], 16))
+
+    with pytest.raises(ValueError):
+        list(page)